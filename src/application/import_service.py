@@ -108,7 +108,7 @@ class ImportService:
             # Process the downloaded content
             if self.archive_processor.is_archive(temp_path):
                 # Process the archive
-                extract_dir = self.archive_processor.extract_archive(temp_path)
+                extract_dir = self.archive_processor.extract_archive(temp_path, css_only=True)
 
                 # Find CSS files
                 is_valid, css_files = self.archive_processor.validate_extracted_content(extract_dir)
@@ -153,13 +153,13 @@ class ImportService:
 
             # Determine what to download
             if gitlab_info['file_path'] and gitlab_info['file_path'].lower().endswith('.css'):
-                # Single CSS file
-                content, file_info = self.gitlab_api.get_file_content(
+                # Single CSS file, fetched raw since it is only written to disk
+                content = self.gitlab_api.get_raw_file(
                     project_id, gitlab_info['file_path'], gitlab_info['branch'])
 
                 # Save to temp file
                 temp_path = self.file_manager.create_temp_file(suffix=".css")
-                with open(temp_path, 'w', encoding='utf-8') as f:
+                with open(temp_path, 'wb') as f:
                     f.write(content)
 
                 # Create mod info
@@ -213,7 +213,7 @@ class ImportService:
                     mod_info.set_commit_hash(commit_sha)
 
                 # Process the archive
-                extract_dir = self.archive_processor.extract_archive(temp_path)
+                extract_dir = self.archive_processor.extract_archive(temp_path, css_only=True)
 
                 # Find CSS files
                 is_valid, css_files = self.archive_processor.validate_extracted_content(extract_dir)
@@ -253,7 +253,7 @@ class ImportService:
             # Process the downloaded content
             if self.archive_processor.is_archive(temp_path):
                 # Process the archive
-                extract_dir = self.archive_processor.extract_archive(temp_path)
+                extract_dir = self.archive_processor.extract_archive(temp_path, css_only=True)
 
                 # Find CSS files
                 is_valid, css_files = self.archive_processor.validate_extracted_content(extract_dir)
@@ -543,7 +543,7 @@ class ImportService:
             if self.archive_processor.is_archive(file_path):
                 # Process the archive
                 # Extract archive
-                extract_dir = self.archive_processor.extract_archive(file_path)
+                extract_dir = self.archive_processor.extract_archive(file_path, css_only=True)
 
                 # Find CSS files
                 is_valid, css_files = self.archive_processor.validate_extracted_content(extract_dir)
@@ -2,7 +2,7 @@ import os
 import sys
 from typing import List, Optional, Dict, Any
 from src.core.models import Profile
-from src.core.profile import ProfileManager
+from src.core.profile import ProfileManager, NON_PROFILE_DIRS
 from src.core.exceptions import ProfileError
 from src.infrastructure.config_store import ConfigStore
 
@@ -17,8 +17,8 @@ class ProfileService:
         """Get all known browser installations"""
         return self.config_store.get_installations()
 
-    def add_browser_installation(self, name: str, path: str) -> bool:
-        """Add a Zen Browser installation"""
+    def add_browser_installation(self, name: str, path: str, flush: bool = True) -> bool:
+        """Add a Zen Browser installation, saved right away unless flush is False"""
         if not os.path.exists(path):
             raise ProfileError(f"Installation path does not exist: {path}")
             
@@ -26,7 +26,17 @@ class ProfileService:
         if 'zen' not in name.lower():
             raise ProfileError("Only Zen Browser installations are supported")
 
-        return self.config_store.add_installation(name, path)
+        return self.config_store.add_installation(name, path, flush)
+
+    def add_browser_installations(self, installations: Dict[str, str]) -> bool:
+        """Add several Zen Browser installations with a single save"""
+        try:
+            for name, path in installations.items():
+                self.add_browser_installation(name, path, flush=False)
+        finally:
+            # Save whatever was added, even if a later installation was rejected
+            saved = self.config_store.flush()
+        return saved
 
     def remove_browser_installation(self, name: str) -> bool:
         """Remove a browser installation"""
@@ -55,15 +65,15 @@ class ProfileService:
         Returns:
             Selected profile
         """
+        profiles = self.get_profiles(installation_path)
         if profile_name:
-            profile = self.get_profile_by_name(installation_path, profile_name)
+            profile = self.profile_manager.get_profile_by_name(installation_path, profile_name, profiles)
             if not profile:
                 raise ProfileError(f"Profile not found: {profile_name}")
             return profile
         else:
-            profile = self.get_default_profile(installation_path)
+            profile = self.profile_manager.get_default_profile(installation_path, profiles)
             if not profile:
-                profiles = self.get_profiles(installation_path)
                 if not profiles:
                     raise ProfileError(f"No profiles found in {installation_path}")
                 return profiles[0]  # Return first profile if no default
@@ -203,19 +213,18 @@ class ProfileService:
             return True
         
         # Check for profile directories specific to Zen Browser
-        invalid_dirs = {'gmp-clearkey', 'default', 'browser', 'fonts', 'uninstall', 'lib', 'bin', 'share', 
-                       'gmp', 'dictionaries', 'extensions', 'features', 'hyphenation', 'minidumps', 'saved-telemetry-pings'}
-        
-        for item in os.listdir(path):
-            item_path = os.path.join(path, item)
-            if os.path.isdir(item_path):
-                # Skip known non-profile directories
-                if item.lower() in invalid_dirs:
-                    continue
-                # Look for profile directories that are specific to Zen Browser
-                if (os.path.exists(os.path.join(item_path, 'prefs.js')) or 
-                    os.path.exists(os.path.join(item_path, 'chrome')) or
-                    item.startswith('Profile')):
-                    return True
+        # scandir reports entry types from the directory listing, avoiding a stat per entry
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    item = entry.name
+                    # Skip known non-profile directories
+                    if item.lower() in NON_PROFILE_DIRS:
+                        continue
+                    # Look for profile directories that are specific to Zen Browser
+                    if (item.startswith('Profile') or
+                        os.path.exists(os.path.join(entry.path, 'prefs.js')) or
+                        os.path.exists(os.path.join(entry.path, 'chrome'))):
+                        return True
         
         return False
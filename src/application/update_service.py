@@ -1,26 +1,94 @@
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Mapping, Tuple, Optional, Any, Iterator
+from contextlib import contextmanager
 from datetime import datetime
+import io
+import itertools
+import logging
 import os
+import random
 import tempfile
+import threading
+import time
 import zipfile
 import shutil
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+from src.core.archive import UNSAFE_PATH_PATTERN
+from src.core.exceptions import RateLimitError
 from src.core.models import ModInfo
 from src.core.download import DownloadManager
 from src.core.mod import ModManager
 from src.infrastructure.github_api import GitHubApi
 from src.infrastructure.gitlab_api import GitLabApi
 
+logger = logging.getLogger(__name__)
+
+# Upper bound on API requests in flight at once, across all worker threads
+MAX_CONCURRENT_REQUESTS = 5
+# Retries for rate-limited requests before giving up
+MAX_RATE_LIMIT_RETRIES = 4
+# Chunk size when streaming files out of archives
+COPY_BUFFER_SIZE = 1024 * 1024
+# Archives up to this size are downloaded into memory instead of a temp file
+MAX_IN_MEMORY_ARCHIVE_SIZE = 100 * 1024 * 1024
+# Seconds a check result may be reused by apply_update
+CHECK_CACHE_TTL = 60
+# Seconds an up-to-date result is reused by check_for_updates without asking
+# the source again, so repeated refreshes cost no requests
+RECHECK_INTERVAL = 300
+# Start of the message of every check that found the installed version current
+_UP_TO_DATE_MESSAGE = "Already up to date"
+# Updates applied at once, so one mod's download overlaps another's extraction
+MAX_CONCURRENT_UPDATES = 3
+# Every capitalization of ".css", for case-insensitive str.endswith checks
+_CSS_SUFFIXES = tuple('.' + ''.join(chars) for chars in itertools.product(*zip('css', 'CSS')))
+# Starting point of every update check result, copied per check. The empty
+# containers are shared, so results are only ever updated by assignment.
+_EMPTY_RESULT: Dict[str, Any] = {
+    'has_update': False,
+    'message': "",
+    'commit_info': {},
+    'diff_info': [],
+    'commit_url': ""
+}
+# Read-only stand-in for missing mod metadata, for paths that only read it.
+# Paths that write to the metadata start from a new dict instead.
+_EMPTY_METADATA: Mapping[str, Any] = MappingProxyType({})
+# Marks a metadata key that was not present
+_MISSING = object()
+
 class UpdateService:
     """Service for checking and applying updates to installed mods"""
 
     def __init__(self, download_manager: DownloadManager,
                 mod_manager: ModManager,
                 github_api: GitHubApi,
-                gitlab_api: GitLabApi):
+                gitlab_api: GitLabApi,
+                max_workers: int = 8):
         self.download_manager = download_manager
         self.mod_manager = mod_manager
         self.github_api = github_api
         self.gitlab_api = gitlab_api
+        # Kept modest to stay clear of GitHub's secondary rate limits
+        self.max_workers = max_workers
+        self._api_sem = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+        # GitLab lookups by source URL and by project path, kept for the service lifetime
+        self._gl_url_cache: Dict[str, Dict[str, Any]] = {}
+        self._gl_project_cache: Dict[str, Dict[str, Any]] = {}
+        # Latest check result per mod name: (version key, update info, time checked)
+        self._last_check: Dict[str, Tuple[Tuple, Dict[str, Any], float]] = {}
+        # The mods file is read and rewritten as a whole, so access is serialized
+        self._mods_lock = threading.Lock()
+        # Worker pools live as long as the service. Every worker thread keeps its
+        # own curl handles, so fresh pools per call would leave a set of handles
+        # and sockets behind on every check or update.
+        self._check_executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._update_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_UPDATES)
+
+    def close(self) -> None:
+        """Shut down the worker pools; work already running is left to finish"""
+        self._check_executor.shutdown(wait=False)
+        self._update_executor.shutdown(wait=False)
 
     def check_for_updates(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -39,10 +107,53 @@ class UpdateService:
 
         # Get all mods
         mods = self.mod_manager.get_all_mods()
+        if not mods:
+            return results
+
+        # Snapshot metadata so changes made while checking (ETags) can be persisted
+        snapshots = [dict(mod.metadata or _EMPTY_METADATA) for mod in mods]
+        version_keys = {mod.name: self._version_key(mod) for mod in mods}
+
+        # Mods found up to date moments ago are not asked about again
+        checks = {}
+        for mod in mods:
+            if mod.source_url:
+                update_info = self._get_cached_check(mod, RECHECK_INTERVAL)
+                if update_info is not None and update_info['message'].startswith(_UP_TO_DATE_MESSAGE):
+                    checks[mod.name] = update_info
+
+        # Group mods by source once so each group can use its source's batch APIs
+        github_mods = []
+        gitlab_mods = []
+        direct_mods = []
+        for mod in mods:
+            if not mod.source_url or mod.name in checks:
+                continue
+            elif "github.com" in mod.source_url:
+                github_mods.append(mod)
+            elif "gitlab.com" in mod.source_url:
+                gitlab_mods.append(mod)
+            else:
+                direct_mods.append(mod)
+
+        # Each check is dominated by network wait, so run them concurrently
+        fresh = set()
+        executor = self._check_executor
+        # All groups are queued before any result is awaited
+        pending = [
+            self._check_github_batch(github_mods, executor),
+            self._check_gitlab_batch(gitlab_mods, executor),
+            self._check_direct_batch(direct_mods, executor)
+        ]
+        for group in pending:
+            for mod_name, update_info in group:
+                checks[mod_name] = update_info
+                fresh.add(mod_name)
 
+        # Report results in mod order
         for mod in mods:
-            # Skip mods without a source URL
             if not mod.source_url:
+                # Skip mods without a source URL
                 results[mod.name] = {
                     'has_update': False,
                     'message': "No source URL",
@@ -50,77 +161,284 @@ class UpdateService:
                 }
                 continue
 
-            # Check based on source type
-            if "github.com" in mod.source_url:
-                update_info = self._check_github_update(mod)
-                update_info['source_type'] = "github"
-            elif "gitlab.com" in mod.source_url:
-                update_info = self._check_gitlab_update(mod)
-                update_info['source_type'] = "gitlab"
-            else:
-                update_info = self._check_direct_update(mod)
-                update_info['source_type'] = "direct"
-
+            update_info = checks[mod.name]
             results[mod.name] = update_info
+            # Reused results keep their time, so the window is not extended
+            if mod.name in fresh:
+                self._last_check[mod.name] = (version_keys[mod.name], update_info, time.monotonic())
+
+        changed = [(mod, before) for mod, before in zip(mods, snapshots)
+                   if (mod.metadata or _EMPTY_METADATA) != before]
+        if changed:
+            try:
+                # One write for all mods whose cached request state changed.
+                # Only the changed metadata keys are copied onto a fresh read,
+                # so mods removed or edited while checking stay that way.
+                with self._mods_lock, self.mod_manager.batch():
+                    for mod, before in changed:
+                        current = self.mod_manager.get_mod_info(mod.name)
+                        if current is None:
+                            continue
+                        after = mod.metadata or _EMPTY_METADATA
+                        metadata = dict(current.metadata or {})
+                        for key, value in after.items():
+                            if before.get(key, _MISSING) != value:
+                                metadata[key] = value
+                        for key in before.keys() - after.keys():
+                            metadata.pop(key, None)
+                        current.metadata = metadata
+                        self.mod_manager.save_mod_info(current)
+            except Exception as e:
+                # Only cached request state, the check results still stand
+                logger.warning("Failed to save mod request state after update check: %s", e)
 
         return results
 
-    def _check_github_update(self, mod: ModInfo) -> Dict[str, Any]:
+    def _check_github_batch(self, mods: List[ModInfo],
+                            executor: ThreadPoolExecutor) -> Iterator[Tuple[str, Dict[str, Any]]]:
         """
-        Check for updates to a GitHub-sourced mod with detailed diff information
-        Focus on CSS file changes only for meaningful updates
-        
+        Check GitHub-sourced mods for updates
+
+        Branch heads are resolved in one batch request, so only mods whose
+        branch moved need their own requests. Checks are queued on the
+        executor immediately and the results are yielded lazily.
+
         Returns:
-            Dictionary with update information
+            Iterator of (mod_name, update_info)
         """
-        result = {
-            'has_update': False,
-            'message': "",
-            'commit_info': {},
-            'diff_info': [],
-            'commit_url': ""
-        }
-        
-        # Check if we have GitHub metadata
-        metadata = mod.metadata or {}
+        latest_commits = self._prefetch_github_commits(mods)
+
+        def check(mod: ModInfo) -> Tuple[str, Dict[str, Any]]:
+            latest_commit = None
+            if latest_commits:
+                try:
+                    latest_commit = latest_commits.get(self._github_repo(mod))
+                except ValueError:
+                    pass
+            update_info = self._check_github_update(mod, latest_commit=latest_commit)
+            update_info['source_type'] = "github"
+            return mod.name, update_info
+
+        return executor.map(check, mods)
+
+    def _check_gitlab_batch(self, mods: List[ModInfo],
+                            executor: ThreadPoolExecutor) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Check GitLab-sourced mods for updates
+
+        Returns:
+            Iterator of (mod_name, update_info)
+        """
+        def check(mod: ModInfo) -> Tuple[str, Dict[str, Any]]:
+            update_info = self._check_gitlab_update(mod)
+            update_info['source_type'] = "gitlab"
+            return mod.name, update_info
+
+        return executor.map(check, mods)
+
+    def _check_direct_batch(self, mods: List[ModInfo],
+                            executor: ThreadPoolExecutor) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Check direct URL mods for updates
+
+        Returns:
+            Iterator of (mod_name, update_info)
+        """
+        def check(mod: ModInfo) -> Tuple[str, Dict[str, Any]]:
+            update_info = self._check_direct_update(mod)
+            update_info['source_type'] = "direct"
+            return mod.name, update_info
+
+        return executor.map(check, mods)
+
+    def _call_api(self, func, *args):
+        """
+        Call a remote API method, limiting concurrency and backing off when rate limited
+
+        Honors the delay suggested by the server, otherwise waits with
+        jittered exponential backoff (capped at 60 seconds).
+        """
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            with self._api_sem:
+                try:
+                    return func(*args)
+                except RateLimitError as e:
+                    if attempt == MAX_RATE_LIMIT_RETRIES:
+                        raise
+                    delay = e.retry_after if e.retry_after is not None else 2 ** attempt + random.random()
+            # Sleep without holding the semaphore so other requests can proceed
+            time.sleep(min(60, delay))
+
+    def _github_repo(self, mod: ModInfo) -> Tuple[str, str, str]:
+        """
+        Get the GitHub repository a mod comes from
+
+        Returns:
+            Tuple of (owner, repo, branch)
+
+        Raises:
+            ValueError: With a user-facing message if it cannot be determined
+        """
+        metadata = mod.metadata or _EMPTY_METADATA
 
         if metadata.get("type") != "github":
             # Try to parse from URL
             try:
                 parts = mod.source_url.split("github.com/", 1)[1].split("/")
-                if len(parts) < 2:
-                    result['message'] = "Invalid GitHub URL format"
-                    return result
+            except Exception:
+                raise ValueError("Failed to parse GitHub URL")
 
-                owner = parts[0]
-                repo = parts[1]
-                branch = "main"  # Default to main if not specified
+            if len(parts) < 2:
+                raise ValueError("Invalid GitHub URL format")
 
-                # If we have more parts, look for branch
-                if len(parts) > 3 and parts[2] in ["blob", "tree"]:
-                    branch = parts[3]
+            owner = parts[0]
+            repo = parts[1]
+            branch = "main"  # Default to main if not specified
 
-            except Exception:
-                result['message'] = "Failed to parse GitHub URL"
-                return result
-        else:
-            # Use metadata
-            owner = metadata.get("owner")
-            repo = metadata.get("repo")
-            branch = metadata.get("branch", "main")
+            # If we have more parts, look for branch
+            if len(parts) > 3 and parts[2] in ["blob", "tree"]:
+                branch = parts[3]
 
-            if not all([owner, repo]):
-                result['message'] = "Incomplete GitHub metadata"
-                return result
+            return owner, repo, branch
+
+        # Use metadata
+        owner = metadata.get("owner")
+        repo = metadata.get("repo")
+        branch = metadata.get("branch", "main")
+
+        if not all([owner, repo]):
+            raise ValueError("Incomplete GitHub metadata")
+
+        return owner, repo, branch
+
+    def _prefetch_github_commits(self, mods: List[ModInfo]) -> Dict[Tuple[str, str, str], Dict[str, Any]]:
+        """
+        Fetch the latest commit of the given GitHub mods in one batch
+
+        Returns an empty dictionary when batching is unavailable (no token),
+        in which case each mod is checked with its own request.
+        """
+        if not getattr(self.github_api, "token", None):
+            return {}
+
+        repos = []
+        for mod in mods:
+            try:
+                repos.append(self._github_repo(mod))
+            except ValueError:
+                continue
+
+        if not repos:
+            return {}
+
+        try:
+            return self._call_api(self.github_api.batch_latest_commits, repos)
+        except Exception:
+            return {}  # Fall back to per-mod requests
+
+    def _store_commit_etag(self, metadata: Dict[str, Any], api) -> None:
+        """Remember the ETag of the stored commit so later checks can be answered with 304"""
+        etag = api.last_headers.get("etag")
+        if etag:
+            metadata["commit_etag"] = etag
+
+    def _format_commit_date(self, date_str: str) -> str:
+        """Format an ISO 8601 commit timestamp for display"""
+        if not date_str:
+            return "Unknown date"
+
+        # GitHub and GitLab emit YYYY-MM-DDTHH:MM:SS..., so slice out the display
+        # fields directly; the local time of the timestamp is shown, as before
+        if len(date_str) >= 16 and date_str[4] == '-' and date_str[10] == 'T' and date_str[13] == ':':
+            return f"{date_str[0:10]} {date_str[11:16]}"
 
         try:
-            # Get latest commit
-            latest_commit = self.github_api.get_latest_commit(owner, repo, branch)
+            date_obj = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+            return date_obj.strftime("%Y-%m-%d %H:%M")
+        except ValueError:
+            return date_str
+
+    def _format_github_commit(self, latest_commit: Dict[str, Any], owner: str,
+                              repo: str, sha: str) -> Tuple[Dict[str, str], str]:
+        """
+        Format GitHub commit data for display
+
+        Returns:
+            Tuple of (commit_info, commit_url)
+        """
+        commit = latest_commit.get("commit", {})
+        author_info = commit.get("author", {})
+        commit_info = {
+            'sha': sha,
+            'message': commit.get("message", "No commit message"),
+            'author': author_info.get("name", "Unknown"),
+            'date': self._format_commit_date(author_info.get("date", ""))
+        }
+        return commit_info, f"https://github.com/{owner}/{repo}/commit/{sha}"
+
+    def _format_gitlab_commit(self, latest_commit: Dict[str, Any],
+                              project_path: Optional[str], sha: str) -> Tuple[Dict[str, str], str]:
+        """
+        Format GitLab commit data for display
+
+        Returns:
+            Tuple of (commit_info, commit_url), the URL is empty without a project path
+        """
+        commit_info = {
+            'sha': sha,
+            'message': latest_commit.get("message", "No commit message"),
+            'author': latest_commit.get("author_name", "Unknown"),
+            'date': self._format_commit_date(latest_commit.get("created_at", ""))
+        }
+        commit_url = f"https://gitlab.com/{project_path}/-/commit/{sha}" if project_path else ""
+        return commit_info, commit_url
+
+    def _check_github_update(self, mod: ModInfo,
+                             latest_commit: Optional[Dict[str, Any]] = None,
+                             detail: bool = True) -> Dict[str, Any]:
+        """
+        Check for updates to a GitHub-sourced mod with detailed diff information
+        Focus on CSS file changes only for meaningful updates
+
+        Args:
+            mod: The mod to check
+            latest_commit: Latest commit data if already fetched (e.g. by a batch query)
+            detail: Whether to collect diff and commit details, otherwise
+                    only 'has_update' is determined
+        
+        Returns:
+            Dictionary with update information
+        """
+        result = _EMPTY_RESULT.copy()
+        
+        # Check if we have GitHub metadata (only written to once a commit is stored)
+        metadata = mod.metadata or _EMPTY_METADATA
+
+        try:
+            owner, repo, branch = self._github_repo(mod)
+        except ValueError as e:
+            result['message'] = str(e)
+            return result
+
+        try:
+            fetched = latest_commit is None
+            if fetched:
+                # Get latest commit, conditionally if we have the ETag of the stored one
+                etag = metadata.get("commit_etag") if "latest_commit" in metadata else None
+                latest_commit = self._call_api(self.github_api.get_latest_commit, owner, repo, branch, etag)
+
+                # Branch has not moved since the stored commit
+                if latest_commit is None:
+                    result['message'] = f"{_UP_TO_DATE_MESSAGE} (v{metadata['latest_commit'][:8]})"
+                    return result
+
             latest_commit_sha = latest_commit.get("sha", "")
             
             # If no new commit, return early
             if "latest_commit" in metadata and metadata["latest_commit"] == latest_commit_sha:
-                result['message'] = f"Already up to date (v{latest_commit_sha[:8]})"
+                if fetched:
+                    self._store_commit_etag(metadata, self.github_api)
+                result['message'] = f"{_UP_TO_DATE_MESSAGE} (v{latest_commit_sha[:8]})"
                 return result
             
             # Check if we have a previous commit to compare
@@ -129,27 +447,8 @@ class UpdateService:
                 result['has_update'] = True
                 result['message'] = f"Version {latest_commit_sha[:8]} available"
                 
-                # Format commit info
-                commit_info = {}
-                commit_info['sha'] = latest_commit_sha
-                commit_info['message'] = latest_commit.get("commit", {}).get("message", "No commit message")
-                
-                author_info = latest_commit.get("commit", {}).get("author", {})
-                commit_info['author'] = author_info.get("name", "Unknown")
-                
-                # Format date
-                date_str = author_info.get("date", "")
-                if date_str:
-                    try:
-                        date_obj = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                        commit_info['date'] = date_obj.strftime("%Y-%m-%d %H:%M")
-                    except ValueError:
-                        commit_info['date'] = date_str
-                else:
-                    commit_info['date'] = "Unknown date"
-                
-                result['commit_info'] = commit_info
-                result['commit_url'] = f"https://github.com/{owner}/{repo}/commit/{latest_commit_sha}"
+                result['commit_info'], result['commit_url'] = self._format_github_commit(
+                    latest_commit, owner, repo, latest_commit_sha)
                 result['diff_info'] = ["Initial version - no previous version to compare"]
                 
                 return result
@@ -158,7 +457,17 @@ class UpdateService:
             previous_commit = metadata["latest_commit"]
             try:
                 # Get list of changed files
-                comparison = self.github_api.compare_commits(owner, repo, previous_commit, latest_commit_sha)
+                comparison = self._call_api(self.github_api.compare_commits, owner, repo, previous_commit, latest_commit_sha)
+
+                if not detail:
+                    # Only the answer is needed, so stop at the first CSS file
+                    if any(file_info.get("filename", "").endswith(_CSS_SUFFIXES)
+                           for file_info in comparison.get("files", [])):
+                        result['has_update'] = True
+                        result['message'] = f"CSS changes in v{latest_commit_sha[:8]}"
+                    else:
+                        result['message'] = "No CSS changes"
+                    return result
                 
                 # Filter for CSS files only
                 css_files_changed = []
@@ -176,7 +485,7 @@ class UpdateService:
                     all_files_changed.append(file_data)
                     
                     # Check if it's a CSS file
-                    if filename.lower().endswith('.css'):
+                    if filename.endswith(_CSS_SUFFIXES):
                         css_files_changed.append(file_data)
                 
                 # Only show update if CSS files have changed
@@ -188,33 +497,14 @@ class UpdateService:
                     # No CSS changes, but show what did change
                     result['has_update'] = False
                     if all_files_changed:
-                        non_css_files = [f['filename'] for f in all_files_changed if not f['filename'].lower().endswith('.css')]
+                        non_css_files = [f['filename'] for f in all_files_changed if not f['filename'].endswith(_CSS_SUFFIXES)]
                         result['message'] = f"No CSS changes (only {', '.join(non_css_files[:3])}{'...' if len(non_css_files) > 3 else ''})"
                     else:
                         result['message'] = "No meaningful changes detected"
                     result['diff_info'] = all_files_changed
                 
-                # Format commit info regardless
-                commit_info = {}
-                commit_info['sha'] = latest_commit_sha
-                commit_info['message'] = latest_commit.get("commit", {}).get("message", "No commit message")
-                
-                author_info = latest_commit.get("commit", {}).get("author", {})
-                commit_info['author'] = author_info.get("name", "Unknown")
-                
-                # Format date
-                date_str = author_info.get("date", "")
-                if date_str:
-                    try:
-                        date_obj = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                        commit_info['date'] = date_obj.strftime("%Y-%m-%d %H:%M")
-                    except ValueError:
-                        commit_info['date'] = date_str
-                else:
-                    commit_info['date'] = "Unknown date"
-                
-                result['commit_info'] = commit_info
-                result['commit_url'] = f"https://github.com/{owner}/{repo}/commit/{latest_commit_sha}"
+                result['commit_info'], result['commit_url'] = self._format_github_commit(
+                    latest_commit, owner, repo, latest_commit_sha)
                 
             except Exception as e:
                 # If we can't get detailed diff, assume there might be changes
@@ -222,27 +512,8 @@ class UpdateService:
                 result['message'] = f"Version {latest_commit_sha[:8]} available (could not check file changes)"
                 result['diff_info'] = ["Could not retrieve detailed file changes"]
                 
-                # Still populate commit info
-                commit_info = {}
-                commit_info['sha'] = latest_commit_sha
-                commit_info['message'] = latest_commit.get("commit", {}).get("message", "No commit message")
-                
-                author_info = latest_commit.get("commit", {}).get("author", {})
-                commit_info['author'] = author_info.get("name", "Unknown")
-                
-                # Format date
-                date_str = author_info.get("date", "")
-                if date_str:
-                    try:
-                        date_obj = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                        commit_info['date'] = date_obj.strftime("%Y-%m-%d %H:%M")
-                    except ValueError:
-                        commit_info['date'] = date_str
-                else:
-                    commit_info['date'] = "Unknown date"
-                
-                result['commit_info'] = commit_info
-                result['commit_url'] = f"https://github.com/{owner}/{repo}/commit/{latest_commit_sha}"
+                result['commit_info'], result['commit_url'] = self._format_github_commit(
+                    latest_commit, owner, repo, latest_commit_sha)
             
             return result
 
@@ -250,23 +521,43 @@ class UpdateService:
             result['message'] = f"Update check failed: {str(e)}"
             return result
 
-    def _check_gitlab_update(self, mod: ModInfo) -> Dict[str, Any]:
+    def _get_gitlab_project(self, source_url: str) -> Tuple[Any, str, str]:
+        """
+        Resolve a GitLab URL to its project, memoized for the service lifetime
+
+        Returns:
+            Tuple of (project_id, project_path, branch)
+        """
+        gitlab_info = self._gl_url_cache.get(source_url)
+        if gitlab_info is None:
+            gitlab_info = self.gitlab_api.parse_gitlab_url(source_url)
+            self._gl_url_cache[source_url] = gitlab_info
+
+        project_path = gitlab_info['project_path']
+        project_info = self._gl_project_cache.get(project_path)
+        if project_info is None:
+            project_info = self._call_api(self.gitlab_api.get_project_info, project_path)
+            self._gl_project_cache[project_path] = project_info
+
+        return project_info['id'], project_path, gitlab_info['branch']
+
+    def _check_gitlab_update(self, mod: ModInfo, detail: bool = True) -> Dict[str, Any]:
         """
         Check for updates to a GitLab-sourced mod with detailed diff information
         Focus on CSS file changes only for meaningful updates
+
+        Args:
+            mod: The mod to check
+            detail: Whether to collect diff and commit details, otherwise
+                    only 'has_update' is determined
         
         Returns:
             Dictionary with update information
         """
-        result = {
-            'has_update': False,
-            'message': "",
-            'commit_info': {},
-            'diff_info': [],
-            'commit_url': ""
-        }
+        result = _EMPTY_RESULT.copy()
         
         # Check if we have GitLab metadata
+        # Written to below, so a new dict rather than the read-only default
         metadata = mod.metadata or {}
         project_id = None
         project_path = None
@@ -274,17 +565,19 @@ class UpdateService:
         if metadata.get("type") != "gitlab":
             # Try to parse from URL
             try:
-                gitlab_info = self.gitlab_api.parse_gitlab_url(mod.source_url)
-                project_path = gitlab_info['project_path']
-                branch = gitlab_info['branch']
-
-                # Get project info
-                project_info = self.gitlab_api.get_project_info(project_path)
-                project_id = project_info['id']
-
+                project_id, project_path, branch = self._get_gitlab_project(mod.source_url)
             except Exception as e:
                 result['message'] = f"Failed to parse GitLab URL: {str(e)}"
                 return result
+
+            # Remember the project so later runs can skip these lookups
+            metadata.update({
+                "type": "gitlab",
+                "project_id": project_id,
+                "project_path": project_path,
+                "branch": branch
+            })
+            mod.metadata = metadata
         else:
             # Use metadata
             project_id = metadata.get("project_id")
@@ -296,13 +589,21 @@ class UpdateService:
                 return result
 
         try:
-            # Get latest commit
-            latest_commit = self.gitlab_api.get_latest_commit(project_id, branch)
+            # Get latest commit, conditionally if we have the ETag of the stored one
+            etag = metadata.get("commit_etag") if "latest_commit" in metadata else None
+            latest_commit = self._call_api(self.gitlab_api.get_latest_commit, project_id, branch, etag)
+
+            # Branch has not moved since the stored commit
+            if latest_commit is None:
+                result['message'] = f"{_UP_TO_DATE_MESSAGE} (v{metadata['latest_commit'][:8]})"
+                return result
+
             latest_commit_sha = latest_commit.get("id", "")
             
             # If no new commit, return early
             if "latest_commit" in metadata and metadata["latest_commit"] == latest_commit_sha:
-                result['message'] = f"Already up to date (v{latest_commit_sha[:8]})"
+                self._store_commit_etag(metadata, self.gitlab_api)
+                result['message'] = f"{_UP_TO_DATE_MESSAGE} (v{latest_commit_sha[:8]})"
                 return result
             
             # Check if we have a previous commit to compare
@@ -311,28 +612,8 @@ class UpdateService:
                 result['has_update'] = True
                 result['message'] = f"Version {latest_commit_sha[:8]} available"
                 
-                # Format commit info
-                commit_info = {}
-                commit_info['sha'] = latest_commit_sha
-                commit_info['message'] = latest_commit.get("message", "No commit message")
-                commit_info['author'] = latest_commit.get("author_name", "Unknown")
-                
-                # Format date
-                date_str = latest_commit.get("created_at", "")
-                if date_str:
-                    try:
-                        date_obj = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                        commit_info['date'] = date_obj.strftime("%Y-%m-%d %H:%M")
-                    except ValueError:
-                        commit_info['date'] = date_str
-                else:
-                    commit_info['date'] = "Unknown date"
-                
-                result['commit_info'] = commit_info
-                
-                # Add commit URL - construct GitLab web URL
-                if project_path:
-                    result['commit_url'] = f"https://gitlab.com/{project_path}/-/commit/{latest_commit_sha}"
+                result['commit_info'], result['commit_url'] = self._format_gitlab_commit(
+                    latest_commit, project_path, latest_commit_sha)
                 
                 result['diff_info'] = ["Initial version - no previous version to compare"]
                 return result
@@ -341,7 +622,19 @@ class UpdateService:
             previous_commit = metadata["latest_commit"]
             try:
                 # Get list of changed files using GitLab API
-                comparison = self.gitlab_api.compare_commits(project_id, previous_commit, latest_commit_sha)
+                comparison = self._call_api(self.gitlab_api.compare_commits, project_id, previous_commit, latest_commit_sha)
+
+                if not detail:
+                    # Only the answer is needed, so stop at the first CSS file
+                    if any(file_info.get("new_path", "").endswith(_CSS_SUFFIXES) or
+                           (file_info.get("new_path") == "/dev/null" and
+                            file_info.get("old_path", "").endswith(_CSS_SUFFIXES))
+                           for file_info in comparison.get("diffs", [])):
+                        result['has_update'] = True
+                        result['message'] = f"CSS changes in v{latest_commit_sha[:8]}"
+                    else:
+                        result['message'] = "No CSS changes"
+                    return result
                 
                 # Filter for CSS files only
                 css_files_changed = []
@@ -373,7 +666,7 @@ class UpdateService:
                     all_files_changed.append(file_data)
                     
                     # Check if it's a CSS file
-                    if filename.lower().endswith('.css') or (new_path and new_path.lower().endswith('.css')):
+                    if filename.endswith(_CSS_SUFFIXES) or (new_path and new_path.endswith(_CSS_SUFFIXES)):
                         css_files_changed.append(file_data)
                 
                 # Only show update if CSS files have changed
@@ -385,34 +678,14 @@ class UpdateService:
                     # No CSS changes, but show what did change
                     result['has_update'] = False
                     if all_files_changed:
-                        non_css_files = [f['filename'] for f in all_files_changed if not f['filename'].lower().endswith('.css')]
+                        non_css_files = [f['filename'] for f in all_files_changed if not f['filename'].endswith(_CSS_SUFFIXES)]
                         result['message'] = f"No CSS changes (only {', '.join(non_css_files[:3])}{'...' if len(non_css_files) > 3 else ''})"
                     else:
                         result['message'] = "No meaningful changes detected"
                     result['diff_info'] = all_files_changed
                 
-                # Format commit info regardless
-                commit_info = {}
-                commit_info['sha'] = latest_commit_sha
-                commit_info['message'] = latest_commit.get("message", "No commit message")
-                commit_info['author'] = latest_commit.get("author_name", "Unknown")
-                
-                # Format date
-                date_str = latest_commit.get("created_at", "")
-                if date_str:
-                    try:
-                        date_obj = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                        commit_info['date'] = date_obj.strftime("%Y-%m-%d %H:%M")
-                    except ValueError:
-                        commit_info['date'] = date_str
-                else:
-                    commit_info['date'] = "Unknown date"
-                
-                result['commit_info'] = commit_info
-                
-                # Add commit URL - construct GitLab web URL
-                if project_path:
-                    result['commit_url'] = f"https://gitlab.com/{project_path}/-/commit/{latest_commit_sha}"
+                result['commit_info'], result['commit_url'] = self._format_gitlab_commit(
+                    latest_commit, project_path, latest_commit_sha)
                 
             except Exception as e:
                 # If we can't get detailed diff, assume there might be changes
@@ -420,28 +693,8 @@ class UpdateService:
                 result['message'] = f"Version {latest_commit_sha[:8]} available (could not check file changes)"
                 result['diff_info'] = ["Could not retrieve detailed file changes"]
                 
-                # Still populate commit info
-                commit_info = {}
-                commit_info['sha'] = latest_commit_sha
-                commit_info['message'] = latest_commit.get("message", "No commit message")
-                commit_info['author'] = latest_commit.get("author_name", "Unknown")
-                
-                # Format date
-                date_str = latest_commit.get("created_at", "")
-                if date_str:
-                    try:
-                        date_obj = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                        commit_info['date'] = date_obj.strftime("%Y-%m-%d %H:%M")
-                    except ValueError:
-                        commit_info['date'] = date_str
-                else:
-                    commit_info['date'] = "Unknown date"
-                
-                result['commit_info'] = commit_info
-                
-                # Add commit URL - construct GitLab web URL
-                if project_path:
-                    result['commit_url'] = f"https://gitlab.com/{project_path}/-/commit/{latest_commit_sha}"
+                result['commit_info'], result['commit_url'] = self._format_gitlab_commit(
+                    latest_commit, project_path, latest_commit_sha)
             
             return result
 
@@ -452,16 +705,11 @@ class UpdateService:
     def _check_direct_update(self, mod: ModInfo) -> Dict[str, Any]:
         """Check for updates to a direct URL mod"""
         # For direct URLs, we can use the HTTP headers to check for changes
-        result = {
-            'has_update': False,
-            'message': "Update checking not fully supported for direct URLs",
-            'commit_info': {},
-            'diff_info': [],
-            'commit_url': ""
-        }
+        result = _EMPTY_RESULT.copy()
+        result['message'] = "Update checking not fully supported for direct URLs"
         
         # Check if we have ETag or Last-Modified stored
-        metadata = mod.metadata or {}
+        metadata = mod.metadata or _EMPTY_METADATA
         etag = metadata.get("etag")
         last_modified = metadata.get("last_modified")
         
@@ -471,7 +719,7 @@ class UpdateService:
             
         try:
             # Use the download manager to check headers
-            headers = self.download_manager.get_url_headers(mod.source_url)
+            headers = self._call_api(self.download_manager.get_url_headers, mod.source_url)
             
             new_etag = headers.get("ETag")
             new_last_modified = headers.get("Last-Modified")
@@ -508,7 +756,7 @@ class UpdateService:
                 result['diff_info'] = ["Content has changed, but detailed diff information is not available for direct URLs"]
                 result['commit_url'] = mod.source_url
             else:
-                result['message'] = "Already up to date"
+                result['message'] = _UP_TO_DATE_MESSAGE
                 
             return result
             
@@ -516,6 +764,30 @@ class UpdateService:
             result['message'] = f"Update check failed: {str(e)}"
             return result
 
+    def apply_updates(self, mod_names: List[str]) -> Iterator[Tuple[str, bool, str]]:
+        """
+        Apply updates to several mods
+
+        Updates run concurrently, so downloading one mod overlaps extracting
+        another. Results are yielded in the order of mod_names.
+
+        Returns:
+            Iterator of (mod_name, success, message)
+        """
+        def apply(mod_name: str) -> Tuple[str, bool, str]:
+            try:
+                success, message = self.apply_update(mod_name)
+            except Exception as e:
+                success, message = False, str(e)
+            return mod_name, success, message
+
+        yield from self._update_executor.map(apply, mod_names)
+
+    def _save_mod(self, mod: ModInfo) -> None:
+        """Save mod info, one thread at a time"""
+        with self._mods_lock:
+            self.mod_manager.save_mod_info(mod)
+
     def apply_update(self, mod_name: str) -> Tuple[bool, str]:
         """
         Apply an update to a mod
@@ -524,7 +796,8 @@ class UpdateService:
             Tuple of (success, message)
         """
         # Get mod info
-        mod = self.mod_manager.get_mod_info(mod_name)
+        with self._mods_lock:
+            mod = self.mod_manager.get_mod_info(mod_name)
         if not mod:
             return False, f"Mod not found: {mod_name}"
 
@@ -534,114 +807,153 @@ class UpdateService:
 
         # Re-download from source
         try:
-            # First check for updates to confirm there's something to update
+            # First check for updates to confirm there's something to update,
+            # reusing a recent check of the same version when there is one
+            update_info = self._get_cached_check(mod)
+
             if "github.com" in mod.source_url:
-                update_info = self._check_github_update(mod)
+                if update_info is None:
+                    update_info = self._check_github_update(mod, detail=False)
                 if not update_info.get('has_update', False):
                     return False, "Already up to date"
-                return self._apply_github_update(mod)
+                success, message = self._apply_github_update(mod)
             elif "gitlab.com" in mod.source_url:
-                update_info = self._check_gitlab_update(mod)
+                if update_info is None:
+                    update_info = self._check_gitlab_update(mod, detail=False)
                 if not update_info.get('has_update', False):
                     return False, "Already up to date"
-                return self._apply_gitlab_update(mod)
+                success, message = self._apply_gitlab_update(mod)
             else:
-                update_info = self._check_direct_update(mod)
+                if update_info is None:
+                    update_info = self._check_direct_update(mod)
                 if not update_info.get('has_update', False):
                     return False, "Already up to date"
-                return self._apply_direct_update(mod)
+                success, message = self._apply_direct_update(mod)
+
+            if success:
+                self._last_check.pop(mod.name, None)
+            return success, message
 
         except Exception as e:
             return False, f"Update failed: {str(e)}"
 
+    def _version_key(self, mod: ModInfo) -> Tuple:
+        """Identify the installed version of a mod"""
+        metadata = mod.metadata or _EMPTY_METADATA
+        return (metadata.get("latest_commit"), metadata.get("etag"), metadata.get("last_modified"))
+
+    def _get_cached_check(self, mod: ModInfo, max_age: float = CHECK_CACHE_TTL) -> Optional[Dict[str, Any]]:
+        """Get the result of a check within max_age seconds for the mod's installed version, if any"""
+        cached = self._last_check.get(mod.name)
+        if cached is None:
+            return None
+
+        version_key, update_info, checked_at = cached
+        if version_key != self._version_key(mod) or time.monotonic() - checked_at > max_age:
+            return None
+
+        return update_info
+
+    @contextmanager
+    def _open_archive(self, download_url: str) -> Iterator[zipfile.ZipFile]:
+        """
+        Download a zip archive and open it
+
+        The archive is kept in memory unless it exceeds MAX_IN_MEMORY_ARCHIVE_SIZE,
+        in which case it is downloaded again to a temporary file.
+        """
+        data = self.download_manager.download_to_bytes(download_url, MAX_IN_MEMORY_ARCHIVE_SIZE)
+        if data is not None:
+            with zipfile.ZipFile(io.BytesIO(data), 'r') as zip_ref:
+                yield zip_ref
+            return
+
+        with tempfile.TemporaryDirectory(prefix="userchrome_update_") as temp_dir:
+            temp_file = os.path.join(temp_dir, "archive.zip")
+            self.download_manager.download_file(download_url, temp_file)
+            with open(temp_file, 'rb', buffering=COPY_BUFFER_SIZE) as archive_file, \
+                    zipfile.ZipFile(archive_file, 'r') as zip_ref:
+                yield zip_ref
+
+    def _extract_css_from_zip(self, zip_ref: zipfile.ZipFile, mod_files: List[str]) -> bool:
+        """
+        Write the CSS files of a repository archive next to each of the mod's files
+
+        Paths are taken relative to the archive's top-level directory
+        (usually repo-branch), entries are streamed without extracting the rest.
+
+        Returns:
+            False if the archive has no top-level directory
+        """
+        names = zip_ref.namelist()
+        if not names or '/' not in names[0]:
+            return False
+        prefix = names[0].split('/', 1)[0] + '/'
+
+        css_entries = []
+        for info in zip_ref.infolist():
+            if info.is_dir() or not info.filename.endswith(_CSS_SUFFIXES):
+                continue
+            if not info.filename.startswith(prefix):
+                continue
+            rel_path = info.filename[len(prefix):]
+            # Skip anything that could escape the destination
+            if UNSAFE_PATH_PATTERN.search(rel_path):
+                continue
+            css_entries.append((info, rel_path))
+
+        # Destination directories, once each even if several mod files share one
+        dest_dirs = dict.fromkeys(os.path.dirname(file_path) for file_path in mod_files)
+        planned = [(info, os.path.join(dest_dir, rel_path))
+                   for dest_dir in dest_dirs for info, rel_path in css_entries]
+
+        # Create every directory needed once, before copying
+        for directory in {os.path.dirname(dest_path) for _, dest_path in planned}:
+            os.makedirs(directory, exist_ok=True)
+
+        # Copy files to replace existing mod
+        for info, dest_path in planned:
+            with zip_ref.open(info) as src, open(dest_path, 'wb') as dst:
+                shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+
+        return True
+
     def _apply_github_update(self, mod: ModInfo) -> Tuple[bool, str]:
         """Apply update to a GitHub-sourced mod"""
+        # Written to below, so a new dict rather than the read-only default
         metadata = mod.metadata or {}
         
         # Extract GitHub repository information
-        if metadata.get("type") != "github":
-            # Try to parse from URL
-            try:
-                parts = mod.source_url.split("github.com/", 1)[1].split("/")
-                if len(parts) < 2:
-                    return False, "Invalid GitHub URL format"
-
-                owner = parts[0]
-                repo = parts[1]
-                branch = "main"  # Default to main if not specified
-
-                # If we have more parts, look for branch
-                if len(parts) > 3 and parts[2] in ["blob", "tree"]:
-                    branch = parts[3]
-            except Exception:
-                return False, "Failed to parse GitHub URL"
-        else:
-            # Use metadata
-            owner = metadata.get("owner")
-            repo = metadata.get("repo")
-            branch = metadata.get("branch", "main")
-
-            if not all([owner, repo]):
-                return False, "Incomplete GitHub metadata"
+        try:
+            owner, repo, branch = self._github_repo(mod)
+        except ValueError as e:
+            return False, str(e)
         
         try:
             # Get latest commit to update metadata
-            latest_commit = self.github_api.get_latest_commit(owner, repo, branch)
+            latest_commit = self._call_api(self.github_api.get_latest_commit, owner, repo, branch)
             latest_commit_sha = latest_commit.get("sha", "")
+            commit_etag = self.github_api.last_headers.get("etag")
+
+            # Nothing to download if the stored commit is still the latest
+            if latest_commit_sha and latest_commit_sha == metadata.get("latest_commit"):
+                return False, "Already up to date"
             
             # Create download URL
             download_url = f"https://github.com/{owner}/{repo}/archive/refs/heads/{branch}.zip"
             
-            # Use download manager to get the repository
-            temp_file = tempfile.mktemp(suffix=".zip")
-            
-            # Download the zip file
-            self.download_manager.download_file(download_url, temp_file)
-            
-            # Extract the zip to a temporary directory
-            temp_dir = tempfile.mkdtemp(prefix="userchrome_update_")
-            
-            # Extract archive
-            with zipfile.ZipFile(temp_file, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
-            
-            # Find the extracted directory (usually repo-branch)
-            extracted_dirs = [d for d in os.listdir(temp_dir) 
-                            if os.path.isdir(os.path.join(temp_dir, d))]
-            
-            if not extracted_dirs:
-                return False, "No files found in downloaded archive"
-            
-            extracted_dir = os.path.join(temp_dir, extracted_dirs[0])
-            
-            # Copy files to replace existing mod
-            for file_path in mod.files:
-                # Get the destination directory
-                dest_dir = os.path.dirname(file_path)
-                
-                # Get source files
-                if os.path.exists(extracted_dir):
-                    # Look for CSS files in the extracted directory
-                    css_files = []
-                    for root, _, files in os.walk(extracted_dir):
-                        for file in files:
-                            if file.lower().endswith('.css'):
-                                css_files.append(os.path.join(root, file))
-                    
-                    if css_files:
-                        for css_file in css_files:
-                            rel_path = os.path.relpath(css_file, extracted_dir)
-                            dest_path = os.path.join(dest_dir, rel_path)
-                            
-                            # Create directory if it doesn't exist
-                            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-                            
-                            # Copy the file
-                            shutil.copy2(css_file, dest_path)
+            # Download the archive and copy the CSS files straight out of it
+            with self._open_archive(download_url) as zip_ref:
+                if not self._extract_css_from_zip(zip_ref, mod.files):
+                    return False, "No files found in downloaded archive"
             
             # Update mod info with new commit info
             metadata["latest_commit"] = latest_commit_sha
             metadata["last_updated"] = datetime.now().isoformat()
+            if commit_etag:
+                metadata["commit_etag"] = commit_etag
+            else:
+                metadata.pop("commit_etag", None)
             
             # If it wasn't a GitHub mod before, update metadata
             if metadata.get("type") != "github":
@@ -651,13 +963,7 @@ class UpdateService:
                 metadata["branch"] = branch
             
             mod.metadata = metadata
-            self.mod_manager.save_mod_info(mod)
-            
-            # Clean up temporary files
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
+            self._save_mod(mod)
             
             return True, f"Updated {mod.name} to latest version"
             
@@ -667,6 +973,7 @@ class UpdateService:
     def _apply_gitlab_update(self, mod: ModInfo) -> Tuple[bool, str]:
         """Apply update to a GitLab-sourced mod"""
         
+        # Written to below, so a new dict rather than the read-only default
         metadata = mod.metadata or {}
         project_id = None
         project_path = None
@@ -676,14 +983,7 @@ class UpdateService:
         if metadata.get("type") != "gitlab":
             # Try to parse from URL
             try:
-                gitlab_info = self.gitlab_api.parse_gitlab_url(mod.source_url)
-                project_path = gitlab_info['project_path']
-                branch = gitlab_info['branch']
-
-                # Get project info
-                project_info = self.gitlab_api.get_project_info(project_path)
-                project_id = project_info['id']
-
+                project_id, project_path, branch = self._get_gitlab_project(mod.source_url)
             except Exception as e:
                 return False, f"Failed to parse GitLab URL: {str(e)}"
         else:
@@ -697,62 +997,29 @@ class UpdateService:
         
         try:
             # Get latest commit to update metadata
-            latest_commit = self.gitlab_api.get_latest_commit(project_id, branch)
+            latest_commit = self._call_api(self.gitlab_api.get_latest_commit, project_id, branch)
             latest_commit_sha = latest_commit.get("id", "")
+            commit_etag = self.gitlab_api.last_headers.get("etag")
+
+            # Nothing to download if the stored commit is still the latest
+            if latest_commit_sha and latest_commit_sha == metadata.get("latest_commit"):
+                return False, "Already up to date"
             
             # Create download URL
             download_url = self.gitlab_api.get_download_url(project_id, branch)
             
-            # Use download manager to get the repository
-            temp_file = tempfile.mktemp(suffix=".zip")
-            
-            # Download the zip file
-            self.download_manager.download_file(download_url, temp_file)
-            
-            # Extract the zip to a temporary directory
-            temp_dir = tempfile.mkdtemp(prefix="userchrome_update_")
-            
-            # Extract archive
-            with zipfile.ZipFile(temp_file, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
-            
-            # Find the extracted directory
-            extracted_dirs = [d for d in os.listdir(temp_dir) 
-                            if os.path.isdir(os.path.join(temp_dir, d))]
-            
-            if not extracted_dirs:
-                return False, "No files found in downloaded archive"
-            
-            extracted_dir = os.path.join(temp_dir, extracted_dirs[0])
-            
-            # Copy files to replace existing mod
-            for file_path in mod.files:
-                # Get the destination directory
-                dest_dir = os.path.dirname(file_path)
-                
-                # Get source files
-                if os.path.exists(extracted_dir):
-                    # Look for CSS files in the extracted directory
-                    css_files = []
-                    for root, _, files in os.walk(extracted_dir):
-                        for file in files:
-                            if file.lower().endswith('.css'):
-                                css_files.append(os.path.join(root, file))
-                    
-                    if css_files:
-                        for css_file in css_files:
-                            rel_path = os.path.relpath(css_file, extracted_dir)
-                            dest_path = os.path.join(dest_dir, rel_path)
-                            
-                            # Create directory if it doesn't exist
-                            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-                            
-                            # Copy the file
-                            shutil.copy2(css_file, dest_path)
+            # Download the archive and copy the CSS files straight out of it
+            with self._open_archive(download_url) as zip_ref:
+                if not self._extract_css_from_zip(zip_ref, mod.files):
+                    return False, "No files found in downloaded archive"
             
             # Update mod info with new commit info
             metadata["latest_commit"] = latest_commit_sha
             metadata["last_updated"] = datetime.now().isoformat()
+            if commit_etag:
+                metadata["commit_etag"] = commit_etag
+            else:
+                metadata.pop("commit_etag", None)
             
             # If it wasn't a GitLab mod before, update metadata
             if metadata.get("type") != "gitlab":
@@ -762,13 +1029,7 @@ class UpdateService:
                 metadata["branch"] = branch
             
             mod.metadata = metadata
-            self.mod_manager.save_mod_info(mod)
-            
-            # Clean up temporary files
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
+            self._save_mod(mod)
             
             return True, f"Updated {mod.name} to latest version"
             
@@ -782,39 +1043,39 @@ class UpdateService:
             return False, "No source URL"
             
         try:
-            # Download the file to a temporary location
-            temp_file = tempfile.mktemp(suffix=os.path.splitext(mod.source_url)[1])
-            
-            # Download the file
-            self.download_manager.download_file(mod.source_url, temp_file)
-            
-            # Get headers to store ETag and Last-Modified
-            headers = self.download_manager.get_url_headers(mod.source_url)
+            # Written to below, so a new dict rather than the read-only default
+            metadata = mod.metadata or {}
+
+            if os.path.splitext(mod.source_url)[1].lower() == '.css':
+                # Direct URL mods are single CSS files, small enough to keep in memory.
+                # Download conditionally, the response carries the new ETag/Last-Modified
+                content, headers = self.download_manager.download_if_modified(
+                    mod.source_url, metadata.get("etag"), metadata.get("last_modified"))
+                if content is None:
+                    return False, "Already up to date"
+            else:
+                content = None
+                headers = self._call_api(self.download_manager.get_url_headers, mod.source_url)
+
             etag = headers.get("ETag", "")
             last_modified = headers.get("Last-Modified", "")
             
             # Update all mod files with the new content
-            for file_path in mod.files:
-                # If it's a CSS file, copy it directly
-                if os.path.splitext(temp_file)[1].lower() == '.css':
+            if content is not None:
+                for file_path in mod.files:
                     # Create directory if it doesn't exist
                     os.makedirs(os.path.dirname(file_path), exist_ok=True)
                     
-                    # Copy the file
-                    shutil.copy2(temp_file, file_path)
+                    with open(file_path, 'wb') as f:
+                        f.write(content)
             
             # Update mod metadata
-            metadata = mod.metadata or {}
             metadata["etag"] = etag
             metadata["last_modified"] = last_modified
             metadata["last_updated"] = datetime.now().isoformat()
             
             mod.metadata = metadata
-            self.mod_manager.save_mod_info(mod)
-            
-            # Clean up temporary file
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+            self._save_mod(mod)
                 
             return True, f"Updated {mod.name} to latest version"
             
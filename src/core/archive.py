@@ -1,13 +1,36 @@
 import os
+import re
 import sys
 import tempfile
 import zipfile
 import tarfile
 import shutil
+import subprocess
+import threading
 import traceback
-from typing import List, Optional, Tuple, Set
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple, Set
 from .exceptions import ArchiveError
 
+# Chunk size when copying decompressed entries to disk
+COPY_BUFFER_SIZE = 1024 * 1024
+# Read buffer for archive files, so entries are read in few large reads
+READ_BUFFER_SIZE = 1024 * 1024
+# Archive member paths that could escape the extraction directory: absolute
+# paths, Windows drive paths and '..' components (either separator)
+UNSAFE_PATH_PATTERN = re.compile(r'^[/\\]|^[A-Za-z]:|(^|[/\\])\.\.([/\\]|$)')
+# Stream-mode tarfile mode for each TAR extension
+SUFFIX_MODE_MAP = {
+    '.tar': 'r|',
+    '.tar.gz': 'r|gz',
+    '.tgz': 'r|gz',
+    '.tar.bz2': 'r|bz2',
+    '.tbz2': 'r|bz2'
+}
+# Multi-threaded decompressors used for compressed tarballs when installed
+PARALLEL_DECOMPRESSORS = {'r|gz': 'pigz', 'r|bz2': 'pbzip2'}
+
 # Try to import libarchive modules
 # Make this completely optional - we'll use built-in modules as primary method
 LIBARCHIVE_AVAILABLE = False
@@ -22,6 +45,10 @@ except ImportError:
 class ArchiveProcessor:
     """Handle archive extraction and processing"""
 
+    # Copy buffers shared by all extractions, one per concurrent copy at most
+    _buffers: List[bytearray] = []
+    _buffers_lock = threading.Lock()
+
     def __init__(self):
         self.supported_extensions = {
             '.zip': self._extract_zip,
@@ -33,38 +60,39 @@ class ArchiveProcessor:
             '.tbz2': self._extract_tar
         }
         
-        # Add libarchive support only if available
+        # Add libarchive support only if available (reported once, at import)
         if LIBARCHIVE_AVAILABLE:
-            print("libarchive support enabled for additional archive formats")
             self.supported_extensions['.7z'] = self._extract_libarchive
             self.supported_extensions['.rar'] = self._extract_libarchive
             self.supported_extensions['.iso'] = self._extract_libarchive
-        else:
-            # Add .xpi to zip formats (Firefox extensions are just zip files)
-            # This ensures we can always handle the main use case
-            self.supported_extensions['.xpi'] = self._extract_zip
+            # libarchive's C reader is faster than zipfile, which stays as the fallback
+            self.supported_extensions['.zip'] = self._extract_libarchive
+            self.supported_extensions['.xpi'] = self._extract_libarchive
 
-    def is_archive(self, file_path: str) -> bool:
-        """Check if a file is a supported archive"""
-        if not os.path.isfile(file_path):
-            return False
+        # Longest first, so that e.g. '.tar.gz' is matched before '.gz'
+        self._ext_tuple = tuple(sorted(self.supported_extensions, key=len, reverse=True))
 
+    def _match_extension(self, file_path: str) -> Optional[str]:
+        """Get the supported extension a file name ends with, if any"""
         file_lower = file_path.lower()
+        if not file_lower.endswith(self._ext_tuple):
+            return None
+        return next(ext for ext in self._ext_tuple if file_lower.endswith(ext))
 
-        for ext in self.supported_extensions:
-            if file_lower.endswith(ext):
-                return True
-
-        return False
+    def is_archive(self, file_path: str) -> bool:
+        """Check if a file is a supported archive"""
+        return file_path.lower().endswith(self._ext_tuple) and os.path.isfile(file_path)
 
     def extract_archive(self, archive_path: str,
-                       extract_dir: Optional[str] = None) -> str:
+                       extract_dir: Optional[str] = None,
+                       css_only: bool = False) -> str:
         """
         Extract an archive to a directory
 
         Args:
             archive_path: Path to the archive file
             extract_dir: Directory to extract to (creates temp dir if not provided)
+            css_only: Only extract CSS files, skipping everything else in the archive
 
         Returns:
             Path to the extracted directory
@@ -77,56 +105,82 @@ class ArchiveProcessor:
             extract_dir = tempfile.mkdtemp(prefix="userchrome_extract_")
 
         # Find the appropriate extraction method
-        file_lower = archive_path.lower()
-        for ext, extract_func in self.supported_extensions.items():
-            if file_lower.endswith(ext):
+        ext = self._match_extension(archive_path)
+        if ext is None:
+            # This should never happen due to the is_archive check
+            raise ArchiveError(f"Unsupported archive format: {archive_path}")
+
+        extract_func = self.supported_extensions[ext]
+        try:
+            return extract_func(archive_path, extract_dir, css_only)
+        except Exception as e:
+            # Clean up on failure
+            if os.path.exists(extract_dir):
                 try:
-                    return extract_func(archive_path, extract_dir)
-                except Exception as e:
-                    # Clean up on failure
-                    if os.path.exists(extract_dir):
-                        try:
-                            shutil.rmtree(extract_dir, ignore_errors=True)
-                        except Exception as cleanup_error:
-                            print(f"Warning: Failed to clean up extraction directory: {cleanup_error}")
-                    
-                    # Print detailed error information
-                    print(f"Archive extraction error ({ext} format): {str(e)}")
-                    print(f"Archive path: {archive_path}")
-                    traceback.print_exc()
+                    shutil.rmtree(extract_dir, ignore_errors=True)
+                except Exception as cleanup_error:
+                    print(f"Warning: Failed to clean up extraction directory: {cleanup_error}")
             
-                    # Attempt fallback to ZIP method for all formats
-                    # This helps with .xpi files (Firefox extensions) that might be misidentified
-                    if not archive_path.lower().endswith('.zip'):
-                        print("Attempting fallback to ZIP extraction method...")
-                        try:
-                            fallback_dir = tempfile.mkdtemp(prefix="userchrome_extract_fallback_")
-                            return self._extract_zip(archive_path, fallback_dir)
-                        except Exception as fallback_error:
-                            print(f"ZIP fallback also failed: {fallback_error}")
-                            pass  # Fallback failed, continue with original error
-            
-                    raise ArchiveError(f"Failed to extract archive: {str(e)}")
-
-        # This should never happen due to the is_archive check
-        raise ArchiveError(f"Unsupported archive format: {archive_path}")
+            # Print detailed error information
+            print(f"Archive extraction error ({ext} format): {str(e)}")
+            print(f"Archive path: {archive_path}")
+            traceback.print_exc()
+    
+            # Attempt fallback to ZIP method for all formats
+            # This helps with .xpi files (Firefox extensions) that might be misidentified
+            if extract_func != self._extract_zip:
+                print("Attempting fallback to ZIP extraction method...")
+                try:
+                    fallback_dir = tempfile.mkdtemp(prefix="userchrome_extract_fallback_")
+                    return self._extract_zip(archive_path, fallback_dir, css_only)
+                except Exception as fallback_error:
+                    print(f"ZIP fallback also failed: {fallback_error}")
+                    pass  # Fallback failed, continue with original error
+    
+            raise ArchiveError(f"Failed to extract archive: {str(e)}")
 
-    def _extract_zip(self, archive_path: str, extract_dir: str) -> str:
-        """Extract a ZIP archive"""
+    def _extract_zip(self, archive_path: str, extract_dir: str, css_only: bool = False) -> str:
+        """Extract a ZIP archive, decompressing entries in parallel"""
         try:
+            # Read the central directory once
             with zipfile.ZipFile(archive_path, 'r') as zip_ref:
-                # Check for dangerous paths (path traversal)
-                for file_info in zip_ref.infolist():
-                    file_path = file_info.filename
-                    if file_path.startswith('/') or '..' in file_path:
-                        raise ArchiveError(f"Potentially unsafe path in archive: {file_path}")
+                infos = zip_ref.infolist()
 
-                # Extract all files
-                zip_ref.extractall(extract_dir)
-                
-                # Check if extraction succeeded
-                if not os.listdir(extract_dir):
-                    raise ArchiveError("ZIP extraction produced no files")
+            # Check for dangerous paths (path traversal) while collecting the
+            # directories to create up front, so workers only write files
+            directories = set()
+            files = []
+            for file_info in infos:
+                file_path = file_info.filename
+                if UNSAFE_PATH_PATTERN.search(file_path):
+                    raise ArchiveError(f"Potentially unsafe path in archive: {file_path}")
+
+                destination = os.path.join(extract_dir, file_path)
+                if file_info.is_dir():
+                    if not css_only:
+                        directories.add(destination)
+                elif not css_only or file_info.filename.lower().endswith('.css'):
+                    directories.add(os.path.dirname(destination))
+                    files.append(file_info)
+            for directory in directories:
+                os.makedirs(directory, exist_ok=True)
+
+            # zlib releases the GIL while inflating, so entries decompress on all cores
+            workers = min(os.cpu_count() or 1, len(files))
+            if workers > 1:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = [
+                        executor.submit(self._extract_zip_entries, archive_path, extract_dir, files[i::workers])
+                        for i in range(workers)
+                    ]
+                    for future in futures:
+                        future.result()
+            elif files:
+                self._extract_zip_entries(archive_path, extract_dir, files)
+
+            # Check if extraction succeeded (an archive without CSS is reported by validation)
+            if not css_only and not os.listdir(extract_dir):
+                raise ArchiveError("ZIP extraction produced no files")
 
             return extract_dir
         except zipfile.BadZipFile as e:
@@ -134,27 +188,53 @@ class ArchiveProcessor:
         except Exception as e:
             raise ArchiveError(f"ZIP extraction error: {str(e)}")
 
-    def _extract_tar(self, archive_path: str, extract_dir: str) -> str:
+    def _extract_zip_entries(self, archive_path: str, extract_dir: str,
+                             infos: List[zipfile.ZipInfo]) -> None:
+        """Extract the given ZIP entries, using a ZipFile of its own (they are not thread-safe)"""
+        with open(archive_path, 'rb', buffering=READ_BUFFER_SIZE) as archive_file, \
+                zipfile.ZipFile(archive_file, 'r') as zip_ref:
+            for file_info in infos:
+                destination = os.path.join(extract_dir, file_info.filename)
+                with zip_ref.open(file_info) as source, open(destination, 'wb', buffering=0) as target:
+                    self._copy_stream(source, target)
+
+    def _copy_stream(self, source, target) -> None:
+        """Copy a stream to a file through a pooled copy buffer"""
+        with self._buffers_lock:
+            buffer = self._buffers.pop() if self._buffers else bytearray(COPY_BUFFER_SIZE)
+        try:
+            with memoryview(buffer) as view:
+                while True:
+                    size = source.readinto(buffer)
+                    if not size:
+                        break
+                    target.write(view[:size])
+        finally:
+            with self._buffers_lock:
+                self._buffers.append(buffer)
+
+    def _extract_tar(self, archive_path: str, extract_dir: str, css_only: bool = False) -> str:
         """Extract a TAR archive (including compressed variants)"""
         try:
-            mode = 'r'
-            if archive_path.lower().endswith(('.tar.gz', '.tgz')):
-                mode = 'r:gz'
-            elif archive_path.lower().endswith(('.tar.bz2', '.tbz2')):
-                mode = 'r:bz2'
+            # Let tarfile detect the compression of anything unexpected
+            mode = SUFFIX_MODE_MAP.get(self._match_extension(archive_path), 'r|*')
 
-            with tarfile.open(archive_path, mode) as tar_ref:
-                # Check for dangerous paths
-                for member in tar_ref.getmembers():
+            with self._open_tar(archive_path, mode) as tar_ref:
+                # Read members one at a time, checking each for dangerous paths
+                # before it is extracted (extract_archive cleans up on failure)
+                for member in tar_ref:
                     file_path = member.name
-                    if file_path.startswith('/') or '..' in file_path:
+                    if UNSAFE_PATH_PATTERN.search(file_path):
                         raise ArchiveError(f"Potentially unsafe path in archive: {file_path}")
 
-                # Extract all files
-                tar_ref.extractall(extract_dir)
-                
+                    # Extract only the CSS files if asked to
+                    if css_only and not (member.isfile() and file_path.lower().endswith('.css')):
+                        continue
+
+                    tar_ref.extract(member, extract_dir)
+
                 # Check if extraction succeeded
-                if not os.listdir(extract_dir):
+                if not css_only and not os.listdir(extract_dir):
                     raise ArchiveError("TAR extraction produced no files")
 
             return extract_dir
@@ -163,23 +243,72 @@ class ArchiveProcessor:
         except Exception as e:
             raise ArchiveError(f"TAR extraction error: {str(e)}")
 
+    @contextmanager
+    def _open_tar(self, archive_path: str, mode: str) -> Iterator[tarfile.TarFile]:
+        """
+        Open a TAR archive as a stream, for reading its members in order
+
+        Compressed archives are piped through pigz/pbzip2 when available, so
+        decompression uses all cores instead of Python's single-threaded codecs.
+        """
+        tool = PARALLEL_DECOMPRESSORS.get(mode)
+        tool_path = shutil.which(tool) if tool else None
+        if tool_path is None:
+            # Stream mode decompresses once, front to back, without building a member index
+            with tarfile.open(archive_path, mode) as tar_ref:
+                yield tar_ref
+            return
+
+        process = subprocess.Popen(
+            [tool_path, '-dc', archive_path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+        )
+        try:
+            # A pipe cannot seek, so read it as a stream
+            with tarfile.open(fileobj=process.stdout, mode='r|') as tar_ref:
+                yield tar_ref
+        finally:
+            process.stdout.close()
+            returncode = process.wait()
+
+        if returncode != 0:
+            raise tarfile.ReadError(f"{tool} exited with status {returncode}")
+
     def find_css_files(self, directory: str) -> List[str]:
         """Find all CSS files in a directory (recursive)"""
         css_files = []
 
-        for root, _, files in os.walk(directory):
-            for file in files:
-                if file.lower().endswith('.css'):
-                    css_files.append(os.path.join(root, file))
+        # Same order as os.walk, but scandir entries carry their type so no
+        # stat is needed per entry
+        stack = [directory]
+        while stack:
+            subdirs = []
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        try:
+                            is_dir = entry.is_dir()
+                        except OSError:
+                            is_dir = False
+                        if not is_dir:
+                            if entry.name.lower().endswith('.css'):
+                                css_files.append(entry.path)
+                        elif not entry.is_symlink():
+                            subdirs.append(entry.path)
+            except OSError:
+                continue
+            stack.extend(reversed(subdirs))
 
         return css_files
 
-    def _extract_libarchive(self, archive_path: str, extract_dir: str) -> str:
+    def _extract_libarchive(self, archive_path: str, extract_dir: str, css_only: bool = False) -> str:
         """Extract an archive using libarchive"""
         if not LIBARCHIVE_AVAILABLE:
             # Instead of failing, try falling back to zip
             print("libarchive not available, attempting to open as zip file...")
-            return self._extract_zip(archive_path, extract_dir)
+            return self._extract_zip(archive_path, extract_dir, css_only)
             
         try:
             # Use libarchive to extract the archive
@@ -187,8 +316,12 @@ class ArchiveProcessor:
                 for entry in archive:
                     # Check for dangerous paths
                     file_path = entry.pathname
-                    if file_path.startswith('/') or '..' in file_path:
+                    if UNSAFE_PATH_PATTERN.search(file_path):
                         raise ArchiveError(f"Potentially unsafe path in archive: {file_path}")
+
+                    # Skip everything but CSS files if asked to
+                    if css_only and (entry.isdir or not file_path.lower().endswith('.css')):
+                        continue
                     
                     # Create directories if needed
                     destination = os.path.join(extract_dir, file_path)
@@ -200,13 +333,12 @@ class ArchiveProcessor:
                     if entry.isdir:
                         continue
                     
-                    # Extract file
-                    with open(destination, 'wb') as f:
-                        for block in entry.get_blocks():
-                            f.write(block)
+                    # Extract file, buffering blocks into large writes
+                    with open(destination, 'wb', buffering=COPY_BUFFER_SIZE) as f:
+                        f.writelines(entry.get_blocks())
             
             # Check if extraction succeeded
-            if not os.listdir(extract_dir):
+            if not css_only and not os.listdir(extract_dir):
                 raise ArchiveError("libarchive extraction produced no files")
                 
             return extract_dir
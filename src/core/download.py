@@ -1,40 +1,221 @@
 import os
+import re
 import json
 import pycurl
 import tempfile
+import threading
 from io import BytesIO
-from typing import Optional, Dict, Tuple, List, Any
+from email.parser import BytesParser
+from http.client import HTTPMessage
+from contextlib import contextmanager
+from typing import Optional, Dict, Tuple, List, Any, Iterator
 from urllib.parse import urlparse
 from .models import ModInfo
 from .exceptions import DownloadError, ValidationError
 
+# owner/repo of a github.com URL, plus branch and path when it points at a file or directory
+GITHUB_URL_PATTERN = re.compile(
+    r'^(?:https?://)?(?:www\.)?github\.com/(?P<owner>[^/?#]+)/(?P<repo>[^/?#]+)'
+    r'(?:/(?P<mode>blob|tree|raw)/(?P<branch>[^/?#]+)/(?P<path>[^?#]+))?')
+
+# Transfers running at once across all threads
+MAX_PARALLEL_DOWNLOADS = 8
+# Receive buffer for file downloads, the largest libcurl accepts
+DOWNLOAD_BUFFER_SIZE = 512 * 1024
+# Byte ranges fetched in parallel by download_segmented
+DOWNLOAD_SEGMENTS = 4
+# Smaller files are not worth the extra requests of a segmented download
+MIN_SEGMENTED_SIZE = 4 * 1024 * 1024
+
+_curl_share = None
+_curl_share_lock = threading.Lock()
+
+def get_curl_share() -> pycurl.CurlShare:
+    """
+    Get the curl share used by all HTTP clients of the application
+
+    Handles attached to it share the DNS cache, TLS sessions and, where
+    libcurl supports it, open connections. Requests to a host that was
+    already contacted (e.g. checking and then applying updates) reuse the
+    warm connection instead of performing a new TLS handshake.
+    """
+    global _curl_share
+    with _curl_share_lock:
+        if _curl_share is None:
+            share = pycurl.CurlShare()
+            share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_DNS)
+            share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_SSL_SESSION)
+            # Connection sharing needs libcurl 7.57+
+            if hasattr(pycurl, "LOCK_DATA_CONNECT"):
+                try:
+                    share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_CONNECT)
+                except pycurl.error:
+                    pass
+            _curl_share = share
+    return _curl_share
+
+def parse_response_headers(data: bytes) -> HTTPMessage:
+    """
+    Parse raw response headers as collected by a HEADERFUNCTION
+
+    Only the last response counts, earlier ones are redirects or interim
+    responses. Lookups on the result ignore case, since HTTP/2 servers send
+    lowercase names.
+    """
+    block = data.rstrip(b'\r\n').rsplit(b'\r\n\r\n', 1)[-1]
+    # Drop the status line
+    _, _, fields = block.partition(b'\r\n')
+    return BytesParser(_class=HTTPMessage).parsebytes(fields, headersonly=True)
+
+def enable_http2(curl: pycurl.Curl) -> None:
+    """
+    Negotiate HTTP/2 over TLS where both libcurl and the server support it
+
+    Plain HTTP and servers without HTTP/2 keep using HTTP/1.1.
+    """
+    version = getattr(pycurl, "CURL_HTTP_VERSION_2TLS", None)
+    if version is None:
+        return
+    try:
+        curl.setopt(pycurl.HTTP_VERSION, version)
+    except pycurl.error:
+        pass  # libcurl built without HTTP/2
+
+def create_multi(multiplex: bool = True) -> pycurl.CurlMulti:
+    """
+    Create a multi handle
+
+    Args:
+        multiplex: Run concurrent HTTP/2 transfers to a host as streams of one
+                   connection; disable to spread them over separate connections
+    """
+    multi = pycurl.CurlMulti()
+    if hasattr(pycurl, "M_PIPELINING"):
+        try:
+            multi.setopt(pycurl.M_PIPELINING, pycurl.PIPE_MULTIPLEX if multiplex else pycurl.PIPE_NOTHING)
+        except (AttributeError, pycurl.error):
+            pass
+    return multi
+
 class DownloadManager:
     def __init__(self):
-        self.curl = None
-        self.setup_curl()
+        # Curl handles are not thread-safe, so each thread gets its own
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._handles: List[pycurl.Curl] = []
+        # Caps the transfers running at once across all threads
+        self._slots = threading.BoundedSemaphore(MAX_PARALLEL_DOWNLOADS)
+        # Taken while acquiring several slots, so two downloads can never
+        # each hold part of what they need and wait on the other
+        self._slots_lock = threading.Lock()
+
+    @property
+    def curl(self) -> pycurl.Curl:
+        """Download handle for the calling thread"""
+        curl = getattr(self._local, "curl", None)
+        if curl is None:
+            curl = self.setup_curl()
+        return curl
+
+    def setup_curl(self) -> pycurl.Curl:
+        """Set up libcurl for downloads on the calling thread"""
+        curl = self._new_curl()
+        self._local.curl = curl
+        with self._lock:
+            self._handles.append(curl)
+        return curl
+
+    @staticmethod
+    def _configure_defaults(curl: pycurl.Curl):
+        """Apply the options shared by every request"""
+        curl.setopt(pycurl.FOLLOWLOCATION, 1)
+        curl.setopt(pycurl.MAXREDIRS, 5)
+        curl.setopt(pycurl.CONNECTTIMEOUT, 30)
+        curl.setopt(pycurl.TIMEOUT, 300)
+        curl.setopt(pycurl.USERAGENT, "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+        curl.setopt(pycurl.SSL_VERIFYPEER, 1)  # Verify SSL certificates
+        curl.setopt(pycurl.SSL_VERIFYHOST, 2)  # Verify hostname
+        curl.setopt(pycurl.DNS_CACHE_TIMEOUT, 600)
+        curl.setopt(pycurl.TCP_KEEPALIVE, 1)
+        enable_http2(curl)
+
+    @staticmethod
+    def _new_curl() -> pycurl.Curl:
+        """Create a handle with the default options, sharing caches with the others"""
+        curl = pycurl.Curl()
+        DownloadManager._configure_defaults(curl)
+        curl.setopt(pycurl.SHARE, get_curl_share())
+        return curl
+
+    @contextmanager
+    def _slots_held(self, count: int) -> Iterator[None]:
+        """Hold several transfer slots, for downloads that open several connections"""
+        with self._slots_lock:
+            for _ in range(count):
+                self._slots.acquire()
+        try:
+            yield
+        finally:
+            for _ in range(count):
+                self._slots.release()
 
-    def setup_curl(self):
-        """Set up libcurl for downloads"""
-        if self.curl:
-            self.curl.close()
-            
-        self.curl = pycurl.Curl()
-        self.curl.setopt(pycurl.FOLLOWLOCATION, 1)
-        self.curl.setopt(pycurl.MAXREDIRS, 5)
-        self.curl.setopt(pycurl.CONNECTTIMEOUT, 30)
-        self.curl.setopt(pycurl.TIMEOUT, 300)
-        self.curl.setopt(pycurl.USERAGENT, "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-        self.curl.setopt(pycurl.SSL_VERIFYPEER, 1)  # Verify SSL certificates
-        self.curl.setopt(pycurl.SSL_VERIFYHOST, 2)  # Verify hostname
+    def _reset_curl(self) -> pycurl.Curl:
+        """
+        Return the download handle with the per-request options cleared
+
+        Resetting keeps the handle's open connections and caches, unlike
+        creating a new handle.
+        """
+        curl = self.curl
+        # The share handle survives the reset, and pycurl refuses to set it twice
+        curl.reset()
+        self._configure_defaults(curl)
+        return curl
 
     def cleanup(self):
         """Clean up resources"""
-        if self.curl:
-            self.curl.close()
-            self.curl = None
+        with self._lock:
+            for curl in self._handles:
+                curl.close()
+            self._handles = []
+        self._local = threading.local()
+
+    def _head_curl(self) -> pycurl.Curl:
+        """Curl handle for HEAD requests on the calling thread"""
+        curl = getattr(self._local, "head_curl", None)
+        if curl is None:
+            curl = self._new_curl()
+            curl.setopt(pycurl.NOBODY, 1)  # Don't download body
+            # Headers always land in this thread's buffer, get_url_headers only clears it
+            headers = bytearray()
+            curl.setopt(pycurl.HEADERFUNCTION, headers.extend)
+            self._local.head_headers = headers
+            self._local.head_curl = curl
+            with self._lock:
+                self._handles.append(curl)
+        return curl
+
+    def validate_url(self, url: str, strict: bool = False) -> bool:
+        """
+        Validate if a URL is properly formatted and supported
+
+        Args:
+            url: The URL to check
+            strict: Also run the URL through urlparse instead of only
+                    checking for an http(s) scheme followed by a host
+        """
+        if not isinstance(url, str):
+            return False
+
+        scheme, separator, rest = url.partition('://')
+        if not separator or scheme.lower() not in ('http', 'https'):
+            return False
+        # The host runs up to the first '/', '?' or '#' and must not be empty
+        if rest[:1] in ('', '/', '?', '#'):
+            return False
+        if not strict:
+            return True
 
-    def validate_url(self, url: str) -> bool:
-        """Validate if a URL is properly formatted and supported"""
         try:
             parsed = urlparse(url)
             return all([parsed.scheme in ['http', 'https'], parsed.netloc])
@@ -46,40 +227,258 @@ class DownloadManager:
         if not self.validate_url(url):
             raise ValidationError(f"Invalid URL: {url}")
 
+        return self._download_file_unchecked(url, destination)
+
+    def _download_file_unchecked(self, url: str, destination: str) -> bool:
+        """Download a file from an already validated URL to destination path"""
         try:
-            # Reset curl options to ensure clean state
-            self.setup_curl()
+            with self._slots:
+                # Reset curl options to ensure clean state
+                curl = self._reset_curl()
             
-            # Set up download with progress tracking
-            with open(destination, 'wb') as f:
-                self.curl.setopt(pycurl.URL, url)
-                self.curl.setopt(pycurl.WRITEDATA, f)
-                self.curl.setopt(pycurl.FOLLOWLOCATION, 1)  # Follow redirects
-                self.curl.setopt(pycurl.MAXREDIRS, 5)  # Maximum redirects
-                self.curl.setopt(pycurl.CONNECTTIMEOUT, 30)  # 30 seconds connect timeout
-                self.curl.setopt(pycurl.TIMEOUT, 300)  # 5 minutes total timeout
-                self.curl.setopt(pycurl.USERAGENT, "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+                # Write straight to the file descriptor, without a Python buffer in between
+                fd = os.open(destination, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+                try:
+                    curl.setopt(pycurl.URL, url)
+                    curl.setopt(pycurl.WRITEFUNCTION, lambda data: os.write(fd, data))
+                    curl.setopt(pycurl.BUFFERSIZE, DOWNLOAD_BUFFER_SIZE)
                 
-                # Perform the request
-                self.curl.perform()
+                    # Perform the request
+                    curl.perform()
 
-                # Check HTTP status code
-                status_code = self.curl.getinfo(pycurl.RESPONSE_CODE)
-                if status_code >= 400:
-                    raise DownloadError(f"HTTP error: {status_code}")
+                    # Check HTTP status code
+                    status_code = curl.getinfo(pycurl.RESPONSE_CODE)
+                    if status_code >= 400:
+                        raise DownloadError(f"HTTP error: {status_code}")
                     
-                # Check download size
-                size = os.path.getsize(destination)
+                    # Check download size
+                    size = os.fstat(fd).st_size
                 
-                if size == 0:
-                    raise DownloadError(f"Downloaded file is empty: {destination}")
+                    if size == 0:
+                        raise DownloadError(f"Downloaded file is empty: {destination}")
 
-                return True
+                    return True
+                finally:
+                    os.close(fd)
         except Exception as e:
             if os.path.exists(destination):
                 os.remove(destination)
             raise DownloadError(f"Download failed: {str(e)}")
 
+    def download_segmented(self, url: str, destination: str,
+                           segments: int = DOWNLOAD_SEGMENTS) -> bool:
+        """
+        Download a large file as several byte ranges in parallel
+
+        Falls back to a single stream when the server does not announce
+        range support and a size, the file is small, or any range request
+        is answered with the whole body instead of 206 Partial Content.
+
+        Args:
+            url: The URL to download
+            destination: Path to write the file to
+            segments: Number of ranges fetched at once
+
+        Returns:
+            True if the download succeeded
+        """
+        if not self.validate_url(url):
+            raise ValidationError(f"Invalid URL: {url}")
+
+        try:
+            headers = self.get_url_headers(url)
+            size = int(headers.get('content-length', 0))
+        except (DownloadError, ValueError):
+            return self._download_file_unchecked(url, destination)
+
+        if headers.get('accept-ranges', '').lower() != 'bytes' or size < MIN_SEGMENTED_SIZE:
+            return self._download_file_unchecked(url, destination)
+
+        # Each range is a connection of its own and takes a slot
+        segments = max(1, min(segments, MAX_PARALLEL_DOWNLOADS))
+        step = -(-size // segments)
+        ranges = [(start, min(start + step, size) - 1) for start in range(0, size, step)]
+        # Ranges are only faster over separate connections
+        multi = create_multi(multiplex=False)
+        handles = []
+        files = []
+        complete = False
+
+        def writer(f, remaining: List[int]):
+            def write(data: bytes):
+                if len(data) > remaining[0]:
+                    return 0  # More than the range, the server ignored it
+                remaining[0] -= len(data)
+                f.write(data)
+            return write
+
+        try:
+            with self._slots_held(len(ranges)):
+                with open(destination, 'wb') as f:
+                    f.truncate(size)
+
+                expected = []
+                for start, end in ranges:
+                    f = open(destination, 'r+b')
+                    f.seek(start)
+                    files.append(f)
+                    remaining = [end - start + 1]
+                    expected.append(remaining)
+                    curl = self._new_curl()
+                    curl.setopt(pycurl.URL, url)
+                    curl.setopt(pycurl.RANGE, f"{start}-{end}")
+                    curl.setopt(pycurl.WRITEFUNCTION, writer(f, remaining))
+                    multi.add_handle(curl)
+                    handles.append(curl)
+
+                while True:
+                    ret, running = multi.perform()
+                    if ret == pycurl.E_CALL_MULTI_PERFORM:
+                        continue
+                    if not running:
+                        break
+                    multi.select(1.0)
+
+                _, succeeded, failed = multi.info_read()
+                complete = (not failed and len(succeeded) == len(handles)
+                            and all(curl.getinfo(pycurl.RESPONSE_CODE) == 206 for curl in handles)
+                            and not any(remaining[0] for remaining in expected))
+        except (pycurl.error, OSError):
+            complete = False
+        finally:
+            for f in files:
+                f.close()
+            for curl in handles:
+                multi.remove_handle(curl)
+                curl.close()
+            multi.close()
+
+        if not complete:
+            # Partial or ignored ranges, fetch the file as one stream instead
+            return self._download_file_unchecked(url, destination)
+
+        return True
+
+    def download_to_bytes(self, url: str, max_size: Optional[int] = None) -> Optional[bytes]:
+        """
+        Download a URL into memory
+
+        Args:
+            url: The URL to download
+            max_size: Abort once the body grows past this many bytes, or right
+                      away when the Content-Length announces a larger body
+
+        Returns:
+            The response body, or None if it was larger than max_size
+        """
+        if not self.validate_url(url):
+            raise ValidationError(f"Invalid URL: {url}")
+
+        buffer = BytesIO()
+        too_large = False
+
+        def write(data: bytes):
+            nonlocal too_large
+            if max_size is not None and buffer.tell() + len(data) > max_size:
+                too_large = True
+                return 0  # Abort the transfer
+            buffer.write(data)
+
+        def header(line: bytes):
+            nonlocal too_large
+            name, _, value = line.partition(b':')
+            if name.strip().lower() == b'content-length' and value.strip().isdigit():
+                if int(value) > max_size:
+                    too_large = True
+                    return 0  # Abort before any of the body is transferred
+
+        try:
+            with self._slots:
+                # Reset curl options to ensure clean state
+                curl = self._reset_curl()
+                curl.setopt(pycurl.URL, url)
+                curl.setopt(pycurl.WRITEFUNCTION, write)
+                if max_size is not None:
+                    curl.setopt(pycurl.HEADERFUNCTION, header)
+
+                try:
+                    curl.perform()
+                except pycurl.error:
+                    if too_large:
+                        return None
+                    raise
+
+                status_code = curl.getinfo(pycurl.RESPONSE_CODE)
+                if status_code >= 400:
+                    raise DownloadError(f"HTTP error: {status_code}")
+
+            data = buffer.getvalue()
+            if not data:
+                raise DownloadError(f"Downloaded file is empty: {url}")
+
+            return data
+        except Exception as e:
+            raise DownloadError(f"Download failed: {str(e)}")
+        finally:
+            buffer.close()
+
+    def download_if_modified(self, url: str, etag: Optional[str] = None,
+                             last_modified: Optional[str] = None) -> Tuple[Optional[bytes], HTTPMessage]:
+        """
+        Download a URL into memory unless it is unchanged
+
+        Args:
+            url: The URL to download
+            etag: ETag of the copy we have, sent as If-None-Match
+            last_modified: Last-Modified of the copy we have, sent as If-Modified-Since
+
+        Returns:
+            Tuple of (content, response headers), content is None if the
+            server answered 304 Not Modified
+        """
+        if not self.validate_url(url):
+            raise ValidationError(f"Invalid URL: {url}")
+
+        conditions = []
+        if etag:
+            conditions.append(f"If-None-Match: {etag}")
+        if last_modified:
+            conditions.append(f"If-Modified-Since: {last_modified}")
+
+        buffer = BytesIO()
+        header_buffer = BytesIO()
+
+        try:
+            with self._slots:
+                # Reset curl options to ensure clean state
+                curl = self._reset_curl()
+                curl.setopt(pycurl.URL, url)
+                curl.setopt(pycurl.WRITEFUNCTION, buffer.write)
+                curl.setopt(pycurl.HEADERFUNCTION, header_buffer.write)
+                if conditions:
+                    curl.setopt(pycurl.HTTPHEADER, conditions)
+                curl.perform()
+
+                status_code = curl.getinfo(pycurl.RESPONSE_CODE)
+
+            headers = parse_response_headers(header_buffer.getvalue())
+
+            if status_code == 304:
+                return None, headers
+            if status_code >= 400:
+                raise DownloadError(f"HTTP error: {status_code}")
+
+            content = buffer.getvalue()
+            if not content:
+                raise DownloadError(f"Downloaded file is empty: {url}")
+
+            return content, headers
+        except Exception as e:
+            raise DownloadError(f"Download failed: {str(e)}")
+        finally:
+            buffer.close()
+            header_buffer.close()
+
     def download_and_validate(self, url: str, validation_func=None) -> Tuple[str, Any]:
         """
         Download a file to a temporary location and validate it
@@ -99,7 +498,7 @@ class DownloadManager:
         os.close(temp_fd)
 
         try:
-            self.download_file(url, temp_path)
+            self._download_file_unchecked(url, temp_path)
 
             # Validate if needed
             validation_result = None
@@ -124,24 +523,21 @@ class DownloadManager:
             raise ValidationError("Not a GitHub URL")
 
         try:
-            # Parse GitHub URL to identify its type
-            parts = url.split("github.com/", 1)[1].split("/")
-
-            if len(parts) < 2:
-                raise ValidationError("Invalid GitHub URL format")
-
-            owner = parts[0]
-            repo = parts[1]
-
             # Identify if it's a raw URL
             if "raw.githubusercontent.com" in url:
                 return self._handle_github_raw_file(url)
 
-            # Check if it's a specific file or directory
-            if len(parts) > 4 and parts[2] == "blob":
-                branch = parts[3]
-                path = "/".join(parts[4:])
-                return self._handle_github_file(owner, repo, branch, path)
+            # Parse GitHub URL to identify its type
+            match = GITHUB_URL_PATTERN.match(url)
+            if not match:
+                raise ValidationError("Invalid GitHub URL format")
+
+            owner = match.group("owner")
+            repo = match.group("repo")
+
+            # Check if it's a specific file
+            if match.group("mode") in ("blob", "raw"):
+                return self._handle_github_file(owner, repo, match.group("branch"), match.group("path"))
 
             # Check if it's a repository root
             api_url = f"https://api.github.com/repos/{owner}/{repo}"
@@ -157,24 +553,29 @@ class DownloadManager:
 
     def _fetch_github_api(self, api_url: str) -> Dict:
         """Fetch data from GitHub API"""
-        buffer = BytesIO()
+        # The body buffer is reused by every API call on this thread
+        buffer = getattr(self._local, "api_buffer", None)
+        if buffer is None:
+            buffer = self._local.api_buffer = bytearray()
+        buffer.clear()
 
         try:
-            self.curl.setopt(pycurl.URL, api_url)
-            self.curl.setopt(pycurl.WRITEDATA, buffer)
-            self.curl.setopt(pycurl.HTTPHEADER, ["Accept: application/vnd.github.v3+json"])
-            self.curl.perform()
-
-            status_code = self.curl.getinfo(pycurl.RESPONSE_CODE)
+            with self._slots:
+                curl = self._reset_curl()
+                curl.setopt(pycurl.URL, api_url)
+                curl.setopt(pycurl.WRITEFUNCTION, buffer.extend)
+                curl.setopt(pycurl.HTTPHEADER, ["Accept: application/vnd.github.v3+json"])
+                curl.perform()
+
+                status_code = curl.getinfo(pycurl.RESPONSE_CODE)
             if status_code >= 400:
                 raise DownloadError(f"GitHub API error: {status_code}")
 
-            return json.loads(buffer.getvalue().decode('utf-8'))
+            # json reads the UTF-8 bytes directly
+            return json.loads(buffer)
 
         except Exception as e:
             raise DownloadError(f"GitHub API request failed: {str(e)}")
-        finally:
-            buffer.close()
 
     def _handle_github_raw_file(self, url: str) -> Tuple[str, ModInfo]:
         """Handle a raw GitHub file URL"""
@@ -221,7 +622,7 @@ class DownloadManager:
 
         try:
             # First check if URL is accessible
-            success = self.download_file(zip_url, temp_path)
+            success = self.download_segmented(zip_url, temp_path)
             
             if not success:
                 raise DownloadError(f"Failed to download from {zip_url}")
@@ -250,7 +651,7 @@ class DownloadManager:
                 os.remove(temp_path)
             raise DownloadError(f"Failed to download GitHub repository: {str(e)}")
 
-    def get_url_headers(self, url: str) -> Dict[str, str]:
+    def get_url_headers(self, url: str) -> HTTPMessage:
         """
         Get HTTP headers from a URL without downloading the content
         
@@ -258,45 +659,29 @@ class DownloadManager:
             url: The URL to check
             
         Returns:
-            Dictionary of HTTP headers
+            HTTP headers of the final response, looked up case-insensitively
         """
         if not self.validate_url(url):
             raise ValidationError(f"Invalid URL: {url}")
             
-        # Set up headers buffer
-        header_buffer = BytesIO()
-        
         try:
-            # Configure curl to only get headers
-            self.curl.setopt(pycurl.URL, url)
-            self.curl.setopt(pycurl.NOBODY, 1)  # Don't download body
-            self.curl.setopt(pycurl.HEADERFUNCTION, header_buffer.write)
-            self.curl.perform()
-            
-            # Reset for future requests
-            self.curl.setopt(pycurl.NOBODY, 0)
-            
+            # Requests for different mods run in parallel, each on its own handle
+            curl = self._head_curl()
+            header_buffer = self._local.head_headers
+            header_buffer.clear()
+            curl.setopt(pycurl.URL, url)
+            curl.perform()
+
             # Get status code
-            status_code = self.curl.getinfo(pycurl.RESPONSE_CODE)
+            status_code = curl.getinfo(pycurl.RESPONSE_CODE)
             if status_code >= 400:
                 raise DownloadError(f"HTTP error: {status_code}")
                 
             # Parse headers
-            header_text = header_buffer.getvalue().decode('utf-8')
-            headers = {}
-            
-            for line in header_text.splitlines():
-                line = line.strip()
-                if line and ':' in line:
-                    name, value = line.split(':', 1)
-                    headers[name.strip()] = value.strip()
-                    
-            return headers
+            return parse_response_headers(bytes(header_buffer))
             
         except Exception as e:
             raise DownloadError(f"Failed to get headers: {str(e)}")
-        finally:
-            header_buffer.close()
     
     def _check_github_updates(self, mod_info: ModInfo) -> Tuple[bool, Optional[str]]:
         """Check if a GitHub-sourced mod has updates available"""
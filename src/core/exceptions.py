@@ -1,3 +1,6 @@
+import time
+from typing import Dict, Optional
+
 class UserChromeLoaderError(Exception):
     """Base exception for UserChrome Loader"""
     pass
@@ -10,6 +13,28 @@ class DownloadError(UserChromeLoaderError):
     """Error for download failures"""
     pass
 
+class RateLimitError(DownloadError):
+    """Error for API requests rejected by rate limiting"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+    @classmethod
+    def from_headers(cls, message: str, headers: Dict[str, str]) -> "RateLimitError":
+        """Build the error from lowercase response headers, honoring Retry-After and reset times"""
+        retry_after = None
+        try:
+            if "retry-after" in headers:
+                retry_after = float(headers["retry-after"])
+            elif "x-ratelimit-reset" in headers:
+                retry_after = max(0.0, float(headers["x-ratelimit-reset"]) - time.time())
+            elif "ratelimit-reset" in headers:
+                retry_after = max(0.0, float(headers["ratelimit-reset"]) - time.time())
+        except ValueError:
+            retry_after = None
+        return cls(message, retry_after)
+
 class FileOperationError(UserChromeLoaderError):
     """Error for file operation failures"""
     pass
@@ -1,19 +1,44 @@
 import os
-import json
-from typing import List, Optional, Dict
+from contextlib import contextmanager
+from dataclasses import replace, fields
+from functools import lru_cache
+from typing import List, Optional, Dict, Tuple, Iterator
 from datetime import datetime
 from .models import ModInfo
 from .exceptions import FileOperationError
+from .storage import json_loads, json_dumps, atomic_write_bytes
+
+@lru_cache(maxsize=1024)
+def _parse_iso_date(value: str) -> datetime:
+    """Parse an ISO date, remembering dates already seen (datetimes are immutable)"""
+    return datetime.fromisoformat(value)
+
+# Fields written to the mods file, in order
+MOD_FIELDS = tuple(f.name for f in fields(ModInfo))
+
+def _to_json(value):
+    """Convert mods for the json module (orjson serializes them itself)"""
+    if isinstance(value, ModInfo):
+        return {name: getattr(value, name) for name in MOD_FIELDS}
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
 
 class ModManager:
     """Manage installed mods and their information"""
 
     def __init__(self):
         self.mods_file = None
+        # Parsed mods file as (stat key, mods by name in file order), replaced as a whole
+        self._cache: Optional[Tuple[Tuple[int, int], Dict[str, ModInfo]]] = None
+        # Mods changed inside batch(), written when the batch ends
+        self._batch: Optional[Dict[str, ModInfo]] = None
+        self._dirty = False
 
     def set_mods_file(self, path: str) -> None:
         """Set the path to the mods info file"""
         self.mods_file = path
+        self._cache = None
 
         # Create directory if it doesn't exist
         mods_dir = os.path.dirname(path)
@@ -25,57 +50,113 @@ class ModManager:
         if not self.mods_file:
             raise FileOperationError("Mods file path not set")
 
-        # Get existing mods
-        mods = self.get_all_mods()
+        if self._batch is not None:
+            self._batch[mod_info.name] = self._copy_mod(mod_info)
+            self._dirty = True
+            return True
 
-        # Update or add mod info
-        for i, mod in enumerate(mods):
-            if mod.name == mod_info.name:
-                mods[i] = mod_info
-                break
-        else:
-            # Mod not found, add it
-            mods.append(mod_info)
+        # Update or add mod info, keeping the position of an existing entry
+        by_name = dict(self._load_mods())
+        by_name[mod_info.name] = mod_info
 
         # Save back to file
-        return self._save_mods(mods)
+        return self._save_mods(list(by_name.values()))
 
     def get_mod_info(self, name: str) -> Optional[ModInfo]:
         """Get information about a specific mod by name"""
         if not self.mods_file:
             raise FileOperationError("Mods file path not set")
 
-        # Get all mods
-        mods = self.get_all_mods()
-
-        # Find the mod by name
-        for mod in mods:
-            if mod.name == name:
-                return mod
-
-        return None
+        mod = self._load_mods().get(name)
+        return self._copy_mod(mod) if mod else None
 
     def get_all_mods(self) -> List[ModInfo]:
         """Get information about all installed mods"""
         if not self.mods_file:
             raise FileOperationError("Mods file path not set")
 
-        if not os.path.exists(self.mods_file):
-            return []
+        return [self._copy_mod(mod) for mod in self._load_mods().values()]
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Collect saves and removals and write the mods file once at the end
+
+        Reads inside the batch see the pending changes. Nested batches
+        are written by the outermost one.
+        """
+        if not self.mods_file:
+            raise FileOperationError("Mods file path not set")
+
+        if self._batch is not None:
+            yield
+            return
+
+        self._batch = dict(self._load_mods())
+        self._dirty = False
+        try:
+            yield
+        finally:
+            by_name, self._batch = self._batch, None
+            if self._dirty:
+                self._dirty = False
+                self._save_mods(list(by_name.values()))
+
+    @staticmethod
+    def _copy_mod(mod: ModInfo) -> ModInfo:
+        """Copy of a cached mod that callers can change freely"""
+        return replace(mod, files=list(mod.files or []),
+                       metadata=dict(mod.metadata) if mod.metadata is not None else None)
+
+    def _stat_key(self) -> Optional[Tuple[int, int]]:
+        """Modification time and size of the mods file, None if it is missing"""
+        try:
+            st = os.stat(self.mods_file)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _load_mods(self) -> Dict[str, ModInfo]:
+        """
+        Get the parsed mods file, reading it only when it changed on disk
+
+        Returns:
+            Dictionary of mod name to mod in file order; shared, must not be modified
+        """
+        if self._batch is not None:
+            return self._batch
+
+        key = self._stat_key()
+        if key is None:
+            return {}
+
+        cache = self._cache
+        if cache is not None and cache[0] == key:
+            return cache[1]
+
+        return self._store_cache(key, self._read_mods())
+
+    def _store_cache(self, key: Tuple[int, int], mods: List[ModInfo]) -> Dict[str, ModInfo]:
+        """Cache parsed mods for the given file state"""
+        by_name = {}
+        for mod in mods:
+            # The first entry of a duplicated name wins, like a linear search
+            by_name.setdefault(mod.name, mod)
+        self._cache = (key, by_name)
+        return by_name
 
+    def _read_mods(self) -> List[ModInfo]:
+        """Parse the mods file"""
         try:
-            with open(self.mods_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(self.mods_file, 'rb') as f:
+                data = json_loads(f.read())
 
             # Convert JSON to ModInfo objects
             mods = []
             for mod_data in data:
                 # Convert installed_date string to datetime
                 if "installed_date" in mod_data and mod_data["installed_date"]:
-                    try:
-                        mod_data["installed_date"] = datetime.fromisoformat(mod_data["installed_date"])
-                    except ValueError:
-                        mod_data["installed_date"] = datetime.now()
+                    mod_data["installed_date"] = self._parse_installed_date(mod_data["installed_date"])
 
                 # Create ModInfo object
                 mods.append(ModInfo(**mod_data))
@@ -86,37 +167,41 @@ class ModManager:
             # If file doesn't exist or is invalid, return empty list
             return []
 
+    @staticmethod
+    def _parse_installed_date(value) -> datetime:
+        """Convert a stored installed_date to a datetime"""
+        if isinstance(value, datetime):
+            return value
+        try:
+            return _parse_iso_date(value)
+        except (TypeError, ValueError):
+            return datetime.now()
+
     def remove_mod(self, name: str) -> bool:
         """Remove a mod from the tracking file"""
         if not self.mods_file:
             raise FileOperationError("Mods file path not set")
 
-        # Get existing mods
-        mods = self.get_all_mods()
+        if self._batch is not None:
+            self._dirty = self._batch.pop(name, None) is not None or self._dirty
+            return True
 
         # Filter out the mod to remove
-        mods = [mod for mod in mods if mod.name != name]
+        by_name = dict(self._load_mods())
+        by_name.pop(name, None)
 
         # Save back to file
-        return self._save_mods(mods)
+        return self._save_mods(list(by_name.values()))
 
     def _save_mods(self, mods: List[ModInfo]) -> bool:
         """Save mods list to file"""
         try:
-            # Convert ModInfo objects to serializable dictionaries
-            mod_dicts = []
-            for mod in mods:
-                mod_dict = mod.__dict__.copy()
-
-                # Convert datetime to string
-                if isinstance(mod_dict["installed_date"], datetime):
-                    mod_dict["installed_date"] = mod_dict["installed_date"].isoformat()
-
-                mod_dicts.append(mod_dict)
+            atomic_write_bytes(self.mods_file, json_dumps(mods, default=_to_json))
 
-            # Save to file
-            with open(self.mods_file, 'w', encoding='utf-8') as f:
-                json.dump(mod_dicts, f, indent=2)
+            # Keep what was written so the next read doesn't parse the file again
+            key = self._stat_key()
+            if key is not None:
+                self._store_cache(key, [self._copy_mod(mod) for mod in mods])
 
             return True
 
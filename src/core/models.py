@@ -1,27 +1,28 @@
 import os
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 
-@dataclass
+# Slotted dataclasses need Python 3.10, older versions keep a __dict__ per instance
+DATACLASS_OPTIONS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**DATACLASS_OPTIONS)
 class Profile:
     """Represents a browser profile"""
     path: str
     name: str
     is_default: bool = False
+    # Derived from path once, the UI reads them on every repaint
+    chrome_dir: str = field(init=False, repr=False, compare=False)
+    userchrome_path: str = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
         # Ensure name is never empty
         if not self.name:
             self.name = os.path.basename(self.path) or "Unnamed Profile"
-
-    @property
-    def chrome_dir(self) -> str:
-        return os.path.join(self.path, "chrome")
-
-    @property
-    def userchrome_path(self) -> str:
-        return os.path.join(self.chrome_dir, "userChrome.css")
+        self.chrome_dir = os.path.join(self.path, "chrome")
+        self.userchrome_path = os.path.join(self.chrome_dir, "userChrome.css")
 
     @property
     def has_chrome_dir(self) -> bool:
@@ -38,7 +39,7 @@ class Profile:
         return self.__str__()
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class ModInfo:
     """Information about an installed mod"""
     name: str
@@ -75,7 +76,7 @@ class ModInfo:
         # Also set version to commit hash for consistency
         self.version = commit_hash[:8]
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class ImportEntry:
     """Represents an import in the userChrome.css file"""
     path: str
@@ -1,60 +1,123 @@
 import os
+import logging
 import json
-from typing import List, Optional, Dict
+import configparser
+from stat import S_ISREG
+from typing import List, Optional, Dict, Tuple, NamedTuple
 from .models import Profile
 from .exceptions import ProfileError
 
+logger = logging.getLogger(__name__)
+
+# Files and directories whose presence marks a browser profile directory
+PROFILE_INDICATORS = frozenset({
+    'prefs.js',          # Browser preferences file
+    'places.sqlite',     # Bookmarks and history database
+    'cookies.sqlite',    # Cookies database
+    'chrome',            # Chrome directory for CSS
+    'extension-preferences.json',
+    'sessionstore.jsonlz4'
+})
+
+# Directories that are NOT profiles (lowercase)
+NON_PROFILE_DIRS = frozenset({
+    'gmp-clearkey', 'default', 'browser', 'fonts', 'uninstall',
+    'lib', 'bin', 'share', 'gmp', 'dictionaries', 'extensions',
+    'features', 'hyphenation', 'minidumps', 'saved-telemetry-pings'
+})
+
+class _ProfileIndex(NamedTuple):
+    """Profiles of an installation with the lookups built alongside them"""
+    profiles: List[Profile]
+    by_name: Dict[str, Profile]
+    default: Optional[Profile]
+
+def _index_profiles(profiles: List[Profile]) -> _ProfileIndex:
+    """Index profiles by name and find the default in one pass (first match wins)"""
+    by_name = {}
+    default = None
+    for profile in profiles:
+        by_name.setdefault(profile.name, profile)
+        if default is None and profile.is_default:
+            default = profile
+    return _ProfileIndex(profiles, by_name, default)
+
 class ProfileManager:
+    def __init__(self):
+        # Profiles read from profiles.ini per installation, with the (mtime, size) of the file
+        self._profiles_cache: Dict[str, Tuple[Tuple[int, int], _ProfileIndex]] = {}
+
     def get_profiles(self, installation_path: str) -> List[Profile]:
         """
         Get all profiles for a given browser installation
         """
-        profiles = []
+        return list(self._get_profile_index(installation_path).profiles)
 
-        print(f"\nLooking for profiles in: {installation_path}")
+    def _get_profile_index(self, installation_path: str) -> _ProfileIndex:
+        """Get the profiles of an installation together with their lookups"""
+        profiles = []
 
-        if not os.path.exists(installation_path):
-            print(f"Installation path does not exist: {installation_path}")
-            return profiles
+        logger.debug("Looking for profiles in: %s", installation_path)
 
-        # Find profiles.ini path
+        # Find profiles.ini path; one stat tells whether it exists and whether it changed
         profiles_ini_path = None
-
-        # Check if the path is to profiles.ini directly
-        if os.path.isfile(installation_path) and os.path.basename(installation_path) == "profiles.ini":
-            profiles_ini_path = installation_path
-        else:
-            # Check for profiles.ini in the directory
-            possible_ini = os.path.join(installation_path, "profiles.ini")
-            if os.path.exists(possible_ini):
-                profiles_ini_path = possible_ini
+        stamp = None
+
+        # Check if the path is to profiles.ini directly, otherwise look in the directory
+        candidates = [os.path.join(installation_path, "profiles.ini")]
+        if os.path.basename(installation_path) == "profiles.ini":
+            candidates.insert(0, installation_path)
+        for candidate in candidates:
+            try:
+                stat = os.stat(candidate)
+            except OSError:
+                continue
+            if S_ISREG(stat.st_mode):
+                profiles_ini_path = candidate
+                stamp = (stat.st_mtime_ns, stat.st_size)
+                break
 
         if not profiles_ini_path:
-            print(f"profiles.ini not found in {installation_path}, looking for profiles directly")
-            return self._find_profiles_without_ini(installation_path)
+            # Only look further when the installation itself exists
+            if not os.path.exists(installation_path):
+                logger.debug("Installation path does not exist: %s", installation_path)
+                return _index_profiles(profiles)
+            logger.debug("profiles.ini not found in %s, looking for profiles directly", installation_path)
+            return _index_profiles(self._find_profiles_without_ini(installation_path))
+
+        # Reuse the last result while profiles.ini is unchanged
+        cached = self._profiles_cache.get(installation_path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
 
-        print(f"Using profiles.ini at: {profiles_ini_path}")
+        logger.debug("Using profiles.ini at: %s", profiles_ini_path)
 
         # Parse profiles.ini
         try:
-            import configparser
+            # Read the file we just stat'ed in one go; Firefox writes it as UTF-8
+            with open(profiles_ini_path, 'r', encoding='utf-8-sig', errors='replace') as f:
+                text = f.read()
             config = configparser.ConfigParser()
-            config.read(profiles_ini_path)
+            config.read_string(text, source=profiles_ini_path)
+
+            logger.debug("Sections in profiles.ini: %s", config.sections())
 
-            print(f"Sections in profiles.ini: {config.sections()}")
+            # Relative profile paths are relative to the directory of profiles.ini
+            ini_dir = os.path.dirname(profiles_ini_path)
 
             for section in config.sections():
                 if section.startswith('Profile'):
                     try:
-                        # Get profile details, similar to your original implementation
-                        path = config.get(section, 'Path', fallback='')
-                        is_relative = config.getboolean(section, 'IsRelative', fallback=True)
-                        name = config.get(section, 'Name', fallback=os.path.basename(path) or section)
-                        is_default = config.getboolean(section, 'Default', fallback=False)
+                        # Get profile details through the section itself
+                        options = config[section]
+                        path = options.get('Path', '')
+                        is_relative = options.getboolean('IsRelative', True)
+                        name = options.get('Name', os.path.basename(path) or section)
+                        is_default = options.getboolean('Default', False)
 
                         # Construct full path
                         if is_relative and path:
-                            profile_path = os.path.join(os.path.dirname(profiles_ini_path), path)
+                            profile_path = os.path.join(ini_dir, path)
                         else:
                             profile_path = path
 
@@ -66,32 +129,31 @@ class ProfileManager:
                         )
 
                         # Debug info
-                        print(f"Found profile:")
-                        print(f"  Section: {section}")
-                        print(f"  Path: {profile_path}")
-                        print(f"  Name: {name}")
-                        print(f"  Is Default: {is_default}")
+                        logger.debug("Found profile: section=%s path=%s name=%s default=%s",
+                                     section, profile_path, name, is_default)
 
                         if os.path.exists(profile_path):
                             profiles.append(profile)
                         else:
-                            print(f"Profile path does not exist: {profile_path}")
+                            logger.debug("Profile path does not exist: %s", profile_path)
 
                     except Exception as e:
-                        print(f"Error processing profile section {section}: {e}")
+                        logger.warning("Error processing profile section %s: %s", section, e)
 
-            return profiles
+            index = _index_profiles(profiles)
+            self._profiles_cache[installation_path] = (stamp, index)
+            return index
 
         except Exception as e:
-            print(f"Failed to parse profiles.ini: {str(e)}")
-            return self._find_profiles_without_ini(installation_path)
+            logger.warning("Failed to parse profiles.ini: %s", e)
+            return _index_profiles(self._find_profiles_without_ini(installation_path))
 
 
     def _find_zen_profiles(self, installation_path: str) -> List[Profile]:
         """Specifically look for Zen Browser profiles"""
         profiles = []
 
-        print(f"\nLooking for profiles in: {installation_path}")
+        logger.debug("Looking for profiles in: %s", installation_path)
 
         # Common profile locations in Zen Browser
         profile_locations = [
@@ -101,17 +163,21 @@ class ProfileManager:
         ]
 
         for location in profile_locations:
-            if not os.path.exists(location) or not os.path.isdir(location):
+            # Missing locations fail the listing itself, no separate checks needed
+            try:
+                entries = list(os.scandir(location))
+            except OSError:
                 continue
 
-            print(f"Checking location: {location}")
+            logger.debug("Checking location: %s", location)
 
             # Look for Profile folders
-            for item in os.listdir(location):
+            for entry in entries:
+                item = entry.name
                 if item.startswith("Profile"):
-                    profile_path = os.path.join(location, item)
-                    if os.path.isdir(profile_path):
-                        print(f"Found profile directory: {profile_path}")
+                    profile_path = entry.path
+                    if entry.is_dir():
+                        logger.debug("Found profile directory: %s", profile_path)
 
                         # Create a profile
                         profile = Profile(
@@ -137,31 +203,30 @@ class ProfileManager:
             os.path.join(installation_path, "Profiles")
         ]
 
-        # Directories that are NOT profiles
-        invalid_dirs = {
-            'gmp-clearkey', 'default', 'browser', 'fonts', 'uninstall', 
-            'lib', 'bin', 'share', 'gmp', 'dictionaries', 'extensions',
-            'features', 'hyphenation', 'minidumps', 'saved-telemetry-pings'
-        }
-
         for profile_dir in profile_dirs:
-            if os.path.exists(profile_dir) and os.path.isdir(profile_dir):
-                # Look for directories that might be profiles
-                for item in os.listdir(profile_dir):
-                    item_path = os.path.join(profile_dir, item)
-                    if os.path.isdir(item_path):
-                        # Skip known non-profile directories
-                        if item.lower() in invalid_dirs:
-                            continue
-                            
-                        # Check if it's a valid profile directory
-                        if self._is_valid_profile_directory(item_path):
-                            profile = Profile(
-                                path=item_path,
-                                name=item,
-                                is_default=False  # We don't know which is default
-                            )
-                            profiles.append(profile)
+            try:
+                it = os.scandir(profile_dir)
+            except OSError:
+                continue
+
+            # Look for directories that might be profiles, straight off the directory stream
+            with it:
+                for entry in it:
+                    if not entry.is_dir():
+                        continue
+                    item = entry.name
+                    # Skip known non-profile directories
+                    if item.lower() in NON_PROFILE_DIRS:
+                        continue
+
+                    # Check if it's a valid profile directory
+                    if self._is_valid_profile_directory(entry.path):
+                        profile = Profile(
+                            path=entry.path,
+                            name=item,
+                            is_default=False  # We don't know which is default
+                        )
+                        profiles.append(profile)
 
         # If we found exactly one profile, mark it as default
         if len(profiles) == 1:
@@ -175,110 +240,34 @@ class ProfileManager:
 
     def _is_valid_profile_directory(self, path: str) -> bool:
         """Check if a directory is a valid Zen Browser profile directory"""
-        if not os.path.isdir(path):
-            return False
-            
-        # Check for profile indicators
-        profile_indicators = [
-            'prefs.js',          # Browser preferences file
-            'places.sqlite',     # Bookmarks and history database
-            'cookies.sqlite',    # Cookies database
-            'chrome',            # Chrome directory for CSS
-            'extension-preferences.json',
-            'sessionstore.jsonlz4'
-        ]
-        
         # A directory is considered a profile if it has at least one profile indicator
-        # or if we can create a chrome directory in it
-        for indicator in profile_indicators:
-            if os.path.exists(os.path.join(path, indicator)):
-                return True
+        # or if we can create a chrome directory in it. One directory read
+        # answers the first part.
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.name in PROFILE_INDICATORS:
+                        return True
+        except (FileNotFoundError, NotADirectoryError):
+            return False
+        except OSError:
+            pass  # Unreadable, it may still be writable
                 
         # If no indicators found, check if we can at least write to create chrome dir
         return self._can_create_chrome_dir(path)
 
-    def _process_profile_section(self, profiles: List[Profile],
-                                installation_path: str,
-                                section_name: str,
-                                section_data: Dict[str, str]) -> None:
-        """Process a profile section from profiles.ini"""
-        if not section_name.startswith('Profile'):
-            return
-
-        path = section_data.get('Path', '')
-
-        # Debug raw data
-        print(f"Raw profile data for {section_name}: {section_data}")
-
-        # Handle relative paths
-        is_relative = section_data.get('IsRelative', '1') == '1'
-        if is_relative:
-            if path:
-                profile_path = os.path.join(installation_path, path)
-            else:
-                # Sometimes Path is empty - try to use Default to find the profile directory
-                profile_number = section_name.replace('Profile', '')
-                profile_path = os.path.join(installation_path, f"Profile{profile_number}")
-
-                # If that doesn't exist, try common profile directories
-                if not os.path.exists(profile_path):
-                    for dir_name in ['Profiles', 'profiles']:
-                        test_path = os.path.join(installation_path, dir_name, f"Profile{profile_number}")
-                        if os.path.exists(test_path):
-                            profile_path = test_path
-                            break
-        else:
-            profile_path = path
-
-        # Extract a meaningful name
-        name = section_data.get('Name', '')
-        if not name:
-            # Use path as fallback name
-            name = os.path.basename(profile_path)
-            if not name or name == '.zen':
-                # Use section name if path basename is empty
-                name = f"Profile {section_name.replace('Profile', '')}"
-
-        is_default = section_data.get('Default', '0') == '1'
-
-        # Print debug info
-        print(f"Processing profile: {name} at {profile_path} (Default: {is_default})")
-
-        # Check if path exists or if we can create the profile directory
-        if os.path.exists(profile_path):
-            profiles.append(Profile(
-                path=profile_path,
-                name=name,
-                is_default=is_default
-            ))
-        else:
-            print(f"Profile path does not exist: {profile_path}")
-            # Try to find the actual profile directory
-            possible_dirs = [
-                os.path.join(installation_path, f"Profile{section_name.replace('Profile', '')}"),
-                os.path.join(installation_path, "Profiles", f"Profile{section_name.replace('Profile', '')}"),
-                os.path.join(installation_path, "profiles", f"Profile{section_name.replace('Profile', '')}")
-            ]
-
-            for test_path in possible_dirs:
-                if os.path.exists(test_path):
-                    print(f"Found alternative profile path: {test_path}")
-                    profiles.append(Profile(
-                        path=test_path,
-                        name=name,
-                        is_default=is_default
-                    ))
-                    break
-
-
-    def get_profile_by_name(self, installation_path: str, name: str) -> Optional[Profile]:
-        """Get a profile by name"""
-        profiles = self.get_profiles(installation_path)
+    def get_profile_by_name(self, installation_path: str, name: str,
+                            profiles: Optional[List[Profile]] = None) -> Optional[Profile]:
+        """Get a profile by name, from the given profiles if already fetched"""
+        if profiles is None:
+            return self._get_profile_index(installation_path).by_name.get(name)
         return next((p for p in profiles if p.name == name), None)
 
-    def get_default_profile(self, installation_path: str) -> Optional[Profile]:
-        """Get the default profile"""
-        profiles = self.get_profiles(installation_path)
+    def get_default_profile(self, installation_path: str,
+                            profiles: Optional[List[Profile]] = None) -> Optional[Profile]:
+        """Get the default profile, from the given profiles if already fetched"""
+        if profiles is None:
+            return self._get_profile_index(installation_path).default
         return next((p for p in profiles if p.is_default), None)
 
     def ensure_chrome_dir(self, profile: Profile) -> str:
@@ -0,0 +1,70 @@
+import os
+import json
+import stat
+from typing import Any, Callable, Optional
+
+# orjson is optional, it only speeds up reading and writing JSON
+ORJSON_AVAILABLE = False
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    pass
+
+# Both parse UTF-8 bytes and raise a ValueError subclass on bad input
+json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+
+def json_dumps(data: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Serialize data to indented UTF-8 JSON
+
+    Args:
+        data: The data to serialize
+        default: Converts values the json module can't serialize itself;
+                 orjson handles dataclasses and datetimes natively
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, default=default).encode('utf-8')
+
+
+def atomic_write_bytes(path: str, data: bytes) -> None:
+    """
+    Replace the contents of a file without ever leaving it half written
+
+    The data is written to a temporary file in the same directory, synced,
+    and swapped in. An existing file keeps its permissions, a new one gets
+    the defaults of the process umask.
+
+    Raises:
+        OSError: If the file could not be written
+    """
+    directory = os.path.dirname(path) or "."
+    prefix = os.path.join(directory, f".{os.path.basename(path)}.")
+
+    # Opened like any new file, so the umask applies as usual
+    while True:
+        temp_path = prefix + os.urandom(6).hex()
+        try:
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+            break
+        except FileExistsError:
+            continue
+
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(temp_path, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
@@ -1,10 +1,34 @@
 import os
+import logging
 import re
+import bisect
 import shutil
+from functools import lru_cache
 from typing import List, Optional, Tuple, Dict, Set
 from .models import Profile, ImportEntry
 from .exceptions import FileOperationError, CircularImportError
 
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=256)
+def _compile_import_pattern(import_path: str) -> 're.Pattern':
+    """Pattern for the import of one path, enabled or commented out"""
+    return re.compile(
+        rf'(/\*\s*)?@import\s+url\(["\']({re.escape(import_path)})["\']\);(\s*\*/)?'
+    )
+
+@lru_cache(maxsize=1024)
+def _normalize_import_path(path: str) -> str:
+    """Normalize an import path for comparison (paths repeat across calls)"""
+    # Replace backslashes with forward slashes
+    path = path.replace('\\', '/')
+
+    # Remove leading ./ if present
+    if path.startswith('./'):
+        path = path[2:]
+
+    return path.strip()
+
 class UserChromeManager:
     """Manages UserChrome CSS files and import statements"""
 
@@ -12,6 +36,11 @@ class UserChromeManager:
     # These patterns match both quoted and unquoted URLs
     IMPORT_PATTERN = re.compile(r'@import\s+url\([\'"]?(.+?)[\'"]?\);')
     COMMENTED_IMPORT_PATTERN = re.compile(r'/\*\s*@import\s+url\([\'"]?(.+?)[\'"]?\);\s*\*/')
+    COMMENT_BLOCK_PATTERN = re.compile(r'/\*.*?\*/', re.DOTALL)
+
+    def __init__(self):
+        # Parsed imports per CSS file, keyed by path with the (mtime_ns, size) they were read at
+        self._imports_file_cache: Dict[str, Tuple[Tuple[int, int], List[ImportEntry]]] = {}
 
     def read_userchrome(self, profile):
         """Read the userChrome.css file content"""
@@ -19,15 +48,23 @@ class UserChromeManager:
             return None
 
         try:
-            with open(profile.userchrome_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except UnicodeDecodeError:
-            # Try with another encoding if UTF-8 fails
-            with open(profile.userchrome_path, 'r', encoding='latin-1') as f:
-                return f.read()
+            # Read the bytes once and decode them in memory
+            with open(profile.userchrome_path, 'rb') as f:
+                raw = f.read()
         except Exception as e:
             raise FileOperationError(f"Failed to read userChrome.css: {str(e)}")
 
+        try:
+            content = raw.decode('utf-8')
+        except UnicodeDecodeError:
+            # Try with another encoding if UTF-8 fails
+            content = raw.decode('latin-1')
+
+        # Translate line endings the way text mode would
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
+
     def write_userchrome(self, profile: Profile, content: str) -> bool:
         """Write content to userChrome.css file"""
         try:
@@ -90,19 +127,27 @@ class UserChromeManager:
         imports = []
         seen_paths = set()
 
-        # Find all active imports
+        # Scan comment blocks once, then bisect per import
+        comment_ranges = [match.span() for match in self.COMMENT_BLOCK_PATTERN.finditer(content)]
+        comment_starts = [start for start, _ in comment_ranges]
+
+        # Matches come in order, so line numbers only need the line breaks
+        # between one match and the next
+        line_number = 1
+        cursor = 0
+
+        # Find all imports; commented-out ones match too and are told apart
+        # by the comment blocks around them
         for match in self.IMPORT_PATTERN.finditer(content):
             path = match.group(1)
-            normalized_path = self._normalize_import_path(path)
+            normalized_path = _normalize_import_path(path)
             start_pos = match.start()
-            line_number = content[:start_pos].count('\n') + 1
+            line_number += content.count('\n', cursor, start_pos)
+            cursor = start_pos
 
             # Check if this import is inside a comment block
-            is_commented = False
-            for comment_match in re.finditer(r'/\*.*?\*/', content, re.DOTALL):
-                if comment_match.start() <= start_pos < comment_match.end():
-                    is_commented = True
-                    break
+            index = bisect.bisect_right(comment_starts, start_pos) - 1
+            is_commented = index >= 0 and start_pos < comment_ranges[index][1]
 
             # Only add if we haven't seen this path before
             if normalized_path not in seen_paths:
@@ -113,51 +158,30 @@ class UserChromeManager:
                 ))
                 seen_paths.add(normalized_path)
 
-        # Find all commented (disabled) imports that weren't already found
-        for match in self.COMMENTED_IMPORT_PATTERN.finditer(content):
-            path = match.group(1)
-            normalized_path = self._normalize_import_path(path)
-            start_pos = match.start()
-        
-            # Only add if we haven't seen this path before
-            if normalized_path not in seen_paths:
-                imports.append(ImportEntry(
-                    path=path,
-                    enabled=False,
-                    line_number=content[:start_pos].count('\n') + 1
-                ))
-                seen_paths.add(normalized_path)
-
-        # Debug output
-        print(f"Found {len(imports)} imports in userChrome.css:")
-        for imp in imports:
-            print(f"  - {imp.path} (enabled: {imp.enabled}, line: {imp.line_number})")
+        # Debug output, skipped entirely unless debug logging is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Found %d imports in userChrome.css:", len(imports))
+            for imp in imports:
+                logger.debug("  - %s (enabled: %s, line: %d)", imp.path, imp.enabled, imp.line_number)
 
         return imports
 
     def has_import(self, content: str, import_path: str) -> bool:
         """Check if an import for the given path exists (enabled or disabled)"""
         # Normalize path for comparison
-        import_path = self._normalize_import_path(import_path)
+        import_path = _normalize_import_path(import_path)
 
-        imports = self.get_imports(content)
-        for import_entry in imports:
-            normalized_path = self._normalize_import_path(import_entry.path)
-            if normalized_path == import_path:
+        # Commented imports contain an import statement too, so one pass finds
+        # every path get_imports would report, without working out their state
+        for match in self.IMPORT_PATTERN.finditer(content):
+            if _normalize_import_path(match.group(1)) == import_path:
                 return True
 
         return False
 
     def _normalize_import_path(self, path: str) -> str:
         """Normalize an import path for comparison"""
-        # Replace backslashes with forward slashes
-        path = path.replace('\\', '/')
-
-        # Remove leading ./ if present
-        if path.startswith('./'):
-            path = path[2:]
-
-        return path.strip()
+        return _normalize_import_path(path)
 
     def add_import(self, content: str, import_path: str) -> str:
         """Add an import statement to userChrome.css content"""
@@ -179,12 +203,10 @@ class UserChromeManager:
     def toggle_import(self, content: str, import_path: str) -> str:
         """Toggle an import on or off"""
         # Normalize path for comparison
-        import_path = self._normalize_import_path(import_path)
+        import_path = _normalize_import_path(import_path)
 
         # Pattern for the specific import
-        pattern = re.compile(
-            rf'(/\*\s*)?@import\s+url\(["\']({re.escape(import_path)})["\']\);(\s*\*/)?'
-        )
+        pattern = _compile_import_pattern(import_path)
 
         def toggle_replacement(match):
             if match.group(1) is not None:
@@ -199,53 +221,56 @@ class UserChromeManager:
     def remove_import(self, content: str, import_path: str) -> str:
         """Remove an import statement from userChrome.css content"""
         # Normalize path for comparison
-        import_path = self._normalize_import_path(import_path)
+        import_path = _normalize_import_path(import_path)
 
         # Pattern for the specific import (with or without comment)
-        pattern = re.compile(
-            rf'(/\*\s*)?@import\s+url\(["\']({re.escape(import_path)})["\']\);(\s*\*/)?'
-        )
+        pattern = _compile_import_pattern(import_path)
 
         # First find all matches to handle line endings properly
         matches = list(pattern.finditer(content))
         if not matches:
             return content  # No matches
 
-        # Process in reverse order to not affect offsets
-        result = content
-        for match in reversed(matches):
+        # Keep the text between the matched lines and join it once
+        parts = []
+        kept_from = 0
+        for match in matches:
             start, end = match.span()
 
             # Find the full line(s) to remove
-            line_start = result.rfind('\n', 0, start) + 1
-            line_end = result.find('\n', end)
+            line_start = content.rfind('\n', 0, start) + 1
+            line_end = content.find('\n', end)
             if line_end == -1:
-                line_end = len(result)
+                line_end = len(content)
 
-            # Remove the line(s)
-            result = result[:line_start] + result[line_end:]
+            # Matches on a line already removed add nothing
+            if line_start > kept_from:
+                parts.append(content[kept_from:line_start])
+            kept_from = max(kept_from, line_end)
 
-        return result
+        parts.append(content[kept_from:])
+        return ''.join(parts)
 
     def _get_last_import_position(self, content: str) -> int:
         """Get the position after the last import statement"""
-        imports = []
-
-        # Find all imports (normal and commented)
-        for match in self.IMPORT_PATTERN.finditer(content):
-            imports.append((match.start(), match.end()))
-
-        for match in self.COMMENTED_IMPORT_PATTERN.finditer(content):
-            imports.append((match.start(), match.end()))
-
-        if not imports:
+        # Walk back from the end of the file to the last @import that parses
+        start = content.rfind('@import')
+        while start != -1:
+            match = self.IMPORT_PATTERN.match(content, start)
+            if match:
+                break
+            start = content.rfind('@import', 0, start)
+        else:
             return -1
 
-        # Sort by end position
-        imports.sort(key=lambda x: x[1])
+        last_pos = match.end()
 
-        # Return the position after the last import
-        _, last_pos = imports[-1]
+        # A commented-out import ends after its closing comment marker
+        comment_start = content.rfind('/*', 0, start)
+        if comment_start != -1:
+            commented = self.COMMENTED_IMPORT_PATTERN.match(content, comment_start)
+            if commented and commented.end() > last_pos:
+                last_pos = commented.end()
 
         # Find the end of the line
         line_end = content.find('\n', last_pos)
@@ -254,54 +279,86 @@ class UserChromeManager:
 
         return line_end
 
+    def _get_imports_for_file(self, file_path: str) -> Optional[List[ImportEntry]]:
+        """
+        Get the imports of a CSS file, re-parsing it only when it changed
+
+        Returns:
+            The imports of the file, or None if it is not a readable file
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        stamp = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self._imports_file_cache.get(file_path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+
+        imports = self.get_imports(content)
+        self._imports_file_cache[file_path] = (stamp, imports)
+        return imports
+
     def check_circular_imports(self, profile: Profile, new_import_path: str,
-                             processed_paths: Optional[Set[str]] = None) -> bool:
+                             processed_paths: Optional[Set[str]] = None,
+                             visited: Optional[Set[str]] = None) -> bool:
         """
         Check for circular imports when adding a new import
 
+        Args:
+            profile: Profile whose chrome directory holds the imports
+            new_import_path: Path of the import being added
+            processed_paths: Paths on the current import chain
+            visited: Paths whose imports were already checked in this call
+
         Returns:
             True if a circular import is detected
         """
         if processed_paths is None:
             processed_paths = set()
+        if visited is None:
+            visited = set()
 
         # Normalize paths for comparison
-        new_import_path = self._normalize_import_path(new_import_path)
+        new_import_path = _normalize_import_path(new_import_path)
 
-        # Add current path to processed paths
-        processed_paths.add(new_import_path)
+        # A file reached again through another branch was already checked
+        if new_import_path in visited:
+            return False
 
         # Build the full path to the imported file
         import_file_path = os.path.join(profile.chrome_dir, new_import_path)
 
-        # Check if the imported file exists
-        if not os.path.isfile(import_file_path):
-            return False  # File doesn't exist, no imports to check
-
-        try:
-            # Read the content of the imported file
-            with open(import_file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Get all imports from the file
-            imports = self.get_imports(content)
+        # Get all imports from the file; a missing or unreadable file has none to check
+        imports = self._get_imports_for_file(import_file_path)
+        if imports is None:
+            visited.add(new_import_path)
+            return False
 
-            for import_entry in imports:
-                path = self._normalize_import_path(import_entry.path)
+        # Add current path to the import chain
+        processed_paths.add(new_import_path)
 
-                # Check if this path has already been processed (circular import)
-                if path in processed_paths:
-                    return True
+        for import_entry in imports:
+            path = _normalize_import_path(import_entry.path)
 
-                # Recursively check this import
-                if self.check_circular_imports(profile, path, processed_paths):
-                    return True
+            # An import back into the current chain is circular
+            if path in processed_paths:
+                return True
 
-            return False
+            # Recursively check this import
+            if self.check_circular_imports(profile, path, processed_paths, visited):
+                return True
 
-        except Exception:
-            # If we can't read the file, assume no circular imports
-            return False
+        processed_paths.discard(new_import_path)
+        visited.add(new_import_path)
+        return False
 
     def ensure_chrome_dir(self, profile):
         """Ensure the chrome directory exists"""
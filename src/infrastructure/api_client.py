@@ -0,0 +1,67 @@
+import pycurl
+import threading
+from typing import Dict, List
+from src.core.download import get_curl_share, enable_http2
+
+class ApiClient:
+    """Per-thread curl handles and response header tracking shared by the API clients"""
+
+    # Sent with every request
+    USER_AGENT = "UserChrome-Loader/1.0"
+
+    def __init__(self, headers: List[str]):
+        # Default request headers, restored after requests that add their own
+        self._headers = headers
+        # Curl handles are not thread-safe, so each thread gets its own
+        self._local = threading.local()
+        self._handles: List[pycurl.Curl] = []
+        self._handles_lock = threading.Lock()
+
+    @property
+    def curl(self) -> pycurl.Curl:
+        """Curl handle for the calling thread"""
+        curl = getattr(self._local, "curl", None)
+        if curl is None:
+            curl = pycurl.Curl()
+            curl.setopt(pycurl.FOLLOWLOCATION, 1)
+            curl.setopt(pycurl.MAXREDIRS, 5)
+            curl.setopt(pycurl.CONNECTTIMEOUT, 30)
+            curl.setopt(pycurl.TIMEOUT, 300)
+            curl.setopt(pycurl.USERAGENT, self.USER_AGENT)
+            curl.setopt(pycurl.HTTPHEADER, self._headers)
+            curl.setopt(pycurl.HEADERFUNCTION, self._store_header)
+            # Reuse connections and TLS sessions across threads and clients
+            curl.setopt(pycurl.SHARE, get_curl_share())
+            enable_http2(curl)
+            self._local.curl = curl
+            self._local.headers = {}
+            with self._handles_lock:
+                self._handles.append(curl)
+        return curl
+
+    def __del__(self):
+        for curl in getattr(self, "_handles", []):
+            curl.close()
+
+    def _store_header(self, line: bytes) -> None:
+        """Collect response headers (lowercase names) for the calling thread"""
+        text = line.decode('iso-8859-1')
+        if text.startswith('HTTP/'):
+            # A new response begins (e.g. after a redirect)
+            self._local.headers = {}
+        elif ':' in text:
+            name, value = text.split(':', 1)
+            self._local.headers[name.strip().lower()] = value.strip()
+
+    @property
+    def last_headers(self) -> Dict[str, str]:
+        """Headers of the last response received on the calling thread"""
+        return getattr(self._local, "headers", {})
+
+    def _is_rate_limited(self, status_code: int) -> bool:
+        """Check if a response was rejected by rate limiting"""
+        if status_code == 429:
+            return True
+        headers = self.last_headers
+        return status_code == 403 and (
+            "retry-after" in headers or headers.get("x-ratelimit-remaining") == "0")
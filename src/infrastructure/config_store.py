@@ -1,7 +1,7 @@
 import os
-import json
 from typing import Any, Dict, Optional
 from src.core.exceptions import FileOperationError
+from src.core.storage import json_loads, json_dumps, atomic_write_bytes
 
 class ConfigStore:
     """Store and retrieve application configuration"""
@@ -9,6 +9,8 @@ class ConfigStore:
     def __init__(self, config_file: str):
         self.config_file = config_file
         self.config = self._load_config()
+        # Changes not written to disk yet
+        self._dirty = False
 
         # Create directory if it doesn't exist
         config_dir = os.path.dirname(config_file)
@@ -21,17 +23,32 @@ class ConfigStore:
             return {}
 
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(self.config_file, 'rb') as f:
+                return json_loads(f.read())
         except Exception:
             # If file is corrupted or invalid, return empty config
             return {}
 
-    def _save_config(self) -> bool:
-        """Save configuration to file"""
+    def _save_config(self, flush: bool = True) -> bool:
+        """
+        Save configuration to file
+
+        Args:
+            flush: Write now; otherwise only mark the configuration as changed
+                   and leave the write to a later flush()
+        """
+        self._dirty = True
+        return self.flush() if flush else True
+
+    def flush(self) -> bool:
+        """Write pending configuration changes to file"""
+        if not self._dirty:
+            return True
+
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2)
+            # Swapped in whole, so a crash never leaves a truncated configuration
+            atomic_write_bytes(self.config_file, json_dumps(self.config))
+            self._dirty = False
             return True
         except Exception as e:
             raise FileOperationError(f"Failed to save configuration: {str(e)}")
@@ -76,11 +93,14 @@ class ConfigStore:
         """Get all known browser installations"""
         return self.get('installations', {})
 
-    def add_installation(self, name: str, path: str) -> bool:
-        """Add a browser installation"""
+    def add_installation(self, name: str, path: str, flush: bool = True) -> bool:
+        """Add a browser installation, written right away unless flush is False"""
         installations = self.get_installations()
+        if installations.get(name) == path:
+            return True  # Already known, nothing to write
         installations[name] = path
-        return self.set('installations', installations)
+        self.config['installations'] = installations
+        return self._save_config(flush)
 
     def remove_installation(self, name: str) -> bool:
         """Remove a browser installation"""
@@ -1,74 +1,194 @@
+import os
 import json
 import pycurl
-import traceback
+import logging
 from io import BytesIO
 from typing import Dict, List, Any, Optional, Tuple
-from src.core.exceptions import DownloadError
+from src.core.exceptions import DownloadError, RateLimitError
+from src.core.storage import json_loads
+from src.infrastructure.api_client import ApiClient
 
-class GitHubApi:
+ACCEPT_HEADER = "Accept: application/vnd.github.v3+json"
+GRAPHQL_URL = "https://api.github.com/graphql"
+# Repositories per GraphQL query, well below GitHub's node limits
+GRAPHQL_BATCH_SIZE = 50
+
+logger = logging.getLogger(__name__)
+
+class GitHubApi(ApiClient):
     """Interface for GitHub API operations"""
 
-    def __init__(self):
-        self.curl = pycurl.Curl()
-        self.curl.setopt(pycurl.FOLLOWLOCATION, 1)
-        self.curl.setopt(pycurl.MAXREDIRS, 5)
-        self.curl.setopt(pycurl.CONNECTTIMEOUT, 30)
-        self.curl.setopt(pycurl.TIMEOUT, 300)
-        self.curl.setopt(pycurl.USERAGENT, "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-        self.curl.setopt(pycurl.HTTPHEADER, ["Accept: application/vnd.github.v3+json"])
-
-    def __del__(self):
-        if self.curl:
-            self.curl.close()
-
-    def fetch_api(self, api_url: str) -> Dict[str, Any]:
-        """Fetch data from GitHub API"""
+    USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+    def __init__(self, token: Optional[str] = None):
+        # Optional token, raises rate limits and enables the GraphQL API
+        self.token = token or os.environ.get("GITHUB_TOKEN")
+        headers = [ACCEPT_HEADER]
+        if self.token:
+            headers.append(f"Authorization: Bearer {self.token}")
+        super().__init__(headers)
+
+    def fetch_api(self, api_url: str, etag: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Fetch data from GitHub API
+
+        Args:
+            api_url: The API URL to fetch
+            etag: ETag of a previous response; when the resource is unchanged
+                  (304 Not Modified) None is returned
+
+        The response ETag is available from last_headers afterwards.
+        """
         buffer = BytesIO()
 
         try:
-            print(f"DEBUG: GitHub API request to {api_url}")
+            logger.debug("GitHub API request to %s", api_url)
             self.curl.setopt(pycurl.URL, api_url)
             self.curl.setopt(pycurl.WRITEDATA, buffer)
-            self.curl.perform()
+            if etag:
+                self.curl.setopt(pycurl.HTTPHEADER, self._headers + [f"If-None-Match: {etag}"])
+            try:
+                self.curl.perform()
+            finally:
+                if etag:
+                    self.curl.setopt(pycurl.HTTPHEADER, self._headers)
 
             status_code = self.curl.getinfo(pycurl.RESPONSE_CODE)
-            print(f"DEBUG: GitHub API response status: {status_code}")
+            logger.debug("GitHub API response status: %s", status_code)
+
+            if status_code == 304:
+                return None
             
             if status_code >= 400:
                 response_data = buffer.getvalue().decode('utf-8')
-                print(f"DEBUG: GitHub API error response: {response_data}")
+                logger.debug("GitHub API error response: %s", response_data)
+                if self._is_rate_limited(status_code):
+                    raise RateLimitError.from_headers(
+                        f"GitHub API rate limit exceeded: {status_code}", self.last_headers)
                 raise DownloadError(f"GitHub API error: {status_code}, Response: {response_data[:200]}")
 
-            response_data = buffer.getvalue().decode('utf-8')
-            result = json.loads(response_data)
-            print(f"DEBUG: GitHub API response length: {len(response_data)} bytes")
+            # The parser takes the UTF-8 bytes directly, no need to decode them first
+            response_data = buffer.getvalue()
+            result = json_loads(response_data)
+            logger.debug("GitHub API response length: %d bytes", len(response_data))
             
             return result
 
+        except RateLimitError:
+            raise
         except Exception as e:
-            print(f"ERROR: GitHub API request failed: {str(e)}")
-            print(f"ERROR: {traceback.format_exc()}")
+            logger.exception("GitHub API request failed: %s", e)
             raise DownloadError(f"GitHub API request failed: {str(e)}")
         finally:
             buffer.close()
 
     def get_repo_info(self, owner: str, repo: str) -> Dict[str, Any]:
         """Get repository information"""
-        print(f"DEBUG: Getting repository info for {owner}/{repo}")
+        logger.debug("Getting repository info for %s/%s", owner, repo)
         api_url = f"https://api.github.com/repos/{owner}/{repo}"
         result = self.fetch_api(api_url)
-        print(f"DEBUG: Repo info retrieved, default branch: {result.get('default_branch', 'unknown')}")
+        logger.debug("Repo info retrieved, default branch: %s", result.get('default_branch', 'unknown'))
         return result
 
     def get_latest_commit(self, owner: str, repo: str,
-                        branch: str = "main") -> Dict[str, Any]:
-        """Get the latest commit in a branch"""
-        print(f"DEBUG: Getting latest commit for {owner}/{repo} branch {branch}")
+                        branch: str = "main",
+                        etag: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get the latest commit in a branch
+
+        If etag is given and the branch has not moved, None is returned.
+        """
+        logger.debug("Getting latest commit for %s/%s branch %s", owner, repo, branch)
         api_url = f"https://api.github.com/repos/{owner}/{repo}/commits/{branch}"
-        result = self.fetch_api(api_url)
-        print(f"DEBUG: Latest commit: {result.get('sha', 'unknown')[:10]}")
+        result = self.fetch_api(api_url, etag)
+        if result is None:
+            logger.debug("Latest commit not modified")
+            return None
+        logger.debug("Latest commit: %.10s", result.get('sha', 'unknown'))
         return result
 
+    def graphql(self, query: str) -> Dict[str, Any]:
+        """Run a GraphQL query (requires a token)"""
+        if not self.token:
+            raise DownloadError("GitHub GraphQL API requires a token")
+
+        buffer = BytesIO()
+
+        try:
+            logger.debug("GitHub GraphQL request")
+            self.curl.setopt(pycurl.URL, GRAPHQL_URL)
+            self.curl.setopt(pycurl.WRITEDATA, buffer)
+            self.curl.setopt(pycurl.HTTPHEADER, self._headers + ["Content-Type: application/json"])
+            self.curl.setopt(pycurl.POSTFIELDS, json.dumps({"query": query}))
+            try:
+                self.curl.perform()
+            finally:
+                # Restore the handle for plain GET requests
+                self.curl.setopt(pycurl.HTTPGET, 1)
+                self.curl.setopt(pycurl.HTTPHEADER, self._headers)
+
+            status_code = self.curl.getinfo(pycurl.RESPONSE_CODE)
+            logger.debug("GitHub GraphQL response status: %s", status_code)
+
+            if status_code >= 400:
+                if self._is_rate_limited(status_code):
+                    raise RateLimitError.from_headers(
+                        f"GitHub API rate limit exceeded: {status_code}", self.last_headers)
+                raise DownloadError(f"GitHub GraphQL error: {status_code}")
+
+            return json_loads(buffer.getvalue())
+
+        except RateLimitError:
+            raise
+        except Exception as e:
+            logger.error("GitHub GraphQL request failed: %s", e)
+            raise DownloadError(f"GitHub GraphQL request failed: {str(e)}")
+        finally:
+            buffer.close()
+
+    def batch_latest_commits(self, repos: List[Tuple[str, str, str]]) -> Dict[Tuple[str, str, str], Dict[str, Any]]:
+        """
+        Get the latest commit of several branches with one GraphQL query per batch
+
+        Args:
+            repos: List of (owner, repo, branch) tuples
+
+        Returns:
+            Dictionary of (owner, repo, branch) to commit data shaped like the
+            REST commits endpoint (sha, commit.message, commit.author). Branches
+            that could not be resolved are left out.
+        """
+        commits = {}
+        repos = list(dict.fromkeys(repos))
+
+        for start in range(0, len(repos), GRAPHQL_BATCH_SIZE):
+            batch = repos[start:start + GRAPHQL_BATCH_SIZE]
+
+            # JSON string literals are valid GraphQL strings
+            fields = []
+            for i, (owner, repo, branch) in enumerate(batch):
+                fields.append(
+                    f"r{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(repo)}) {{ "
+                    f"ref(qualifiedName: {json.dumps('refs/heads/' + branch)}) {{ "
+                    "target { ... on Commit { oid message author { name date } } } } }"
+                )
+            response = self.graphql("query { " + " ".join(fields) + " }")
+            data = response.get("data") or {}
+
+            for i, key in enumerate(batch):
+                target = ((data.get(f"r{i}") or {}).get("ref") or {}).get("target") or {}
+                if not target.get("oid"):
+                    continue
+                commits[key] = {
+                    "sha": target["oid"],
+                    "commit": {
+                        "message": target.get("message", ""),
+                        "author": target.get("author") or {}
+                    }
+                }
+
+        return commits
+
     def get_file_content(self, owner: str, repo: str, path: str,
                        branch: str = "main") -> Tuple[str, Dict[str, Any]]:
         """
@@ -77,22 +197,22 @@ class GitHubApi:
         Returns:
             Tuple of (content, file_info)
         """
-        print(f"DEBUG: Getting file content for {owner}/{repo}/{path} (branch: {branch})")
+        logger.debug("Getting file content for %s/%s/%s (branch: %s)", owner, repo, path, branch)
         api_url = f"https://api.github.com/repos/{owner}/{repo}/contents/{path}?ref={branch}"
         file_info = self.fetch_api(api_url)
 
         # Check if it's a file
         if file_info.get("type") != "file":
-            print(f"ERROR: Not a file: {path}, type: {file_info.get('type')}")
+            logger.error("Not a file: %s, type: %s", path, file_info.get('type'))
             raise DownloadError(f"Not a file: {path}")
 
         # Get the content
         download_url = file_info.get("download_url")
         if not download_url:
-            print(f"ERROR: No download URL for file: {path}")
+            logger.error("No download URL for file: %s", path)
             raise DownloadError(f"No download URL for file: {path}")
 
-        print(f"DEBUG: Downloading file from {download_url}")
+        logger.debug("Downloading file from %s", download_url)
         # Download the file content
         buffer = BytesIO()
         try:
@@ -101,18 +221,18 @@ class GitHubApi:
             self.curl.perform()
 
             status_code = self.curl.getinfo(pycurl.RESPONSE_CODE)
-            print(f"DEBUG: File download status: {status_code}")
+            logger.debug("File download status: %s", status_code)
             
             if status_code >= 400:
                 raise DownloadError(f"GitHub download error: {status_code}")
 
-            content = buffer.getvalue().decode('utf-8')
-            print(f"DEBUG: Downloaded {len(content)} bytes of content")
+            # Decode straight from the buffer, without copying it to bytes first
+            content = str(buffer.getbuffer(), 'utf-8')
+            logger.debug("Downloaded %d characters of content", len(content))
             return content, file_info
 
         except Exception as e:
-            print(f"ERROR: GitHub file download failed: {str(e)}")
-            print(f"ERROR: {traceback.format_exc()}")
+            logger.exception("GitHub file download failed: %s", e)
             raise DownloadError(f"GitHub file download failed: {str(e)}")
         finally:
             buffer.close()
@@ -136,7 +256,7 @@ class GitHubApi:
                        branch: str = "main") -> str:
         """Get URL for downloading a repository as a ZIP file"""
         url = f"https://github.com/{owner}/{repo}/archive/refs/heads/{branch}.zip"
-        print(f"DEBUG: GitHub repo download URL: {url}")
+        logger.debug("GitHub repo download URL: %s", url)
         return url
         
     def compare_commits(self, owner: str, repo: str, 
@@ -1,41 +1,58 @@
-import json
+import base64
 import pycurl
 import urllib.parse
 from io import BytesIO
 from typing import Dict, List, Any, Optional, Tuple
-from src.core.exceptions import DownloadError
+from src.core.exceptions import DownloadError, RateLimitError
+from src.core.storage import json_loads
+from src.infrastructure.api_client import ApiClient
 
-class GitLabApi:
+class GitLabApi(ApiClient):
     """Interface for GitLab API operations"""
 
     def __init__(self, instance: str = "https://gitlab.com"):
+        super().__init__([])
         self.instance = instance.rstrip('/')
-        self.curl = pycurl.Curl()
-        self.curl.setopt(pycurl.FOLLOWLOCATION, 1)
-        self.curl.setopt(pycurl.MAXREDIRS, 5)
-        self.curl.setopt(pycurl.CONNECTTIMEOUT, 30)
-        self.curl.setopt(pycurl.TIMEOUT, 300)
-        self.curl.setopt(pycurl.USERAGENT, "UserChrome-Loader/1.0")
-
-    def __del__(self):
-        if self.curl:
-            self.curl.close()
-
-    def fetch_api(self, api_url: str) -> Dict[str, Any]:
-        """Fetch data from GitLab API"""
+
+    def fetch_api(self, api_url: str, etag: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Fetch data from GitLab API
+
+        Args:
+            api_url: The API URL to fetch
+            etag: ETag of a previous response; when the resource is unchanged
+                  (304 Not Modified) None is returned
+
+        The response ETag is available from last_headers afterwards.
+        """
         buffer = BytesIO()
 
         try:
             self.curl.setopt(pycurl.URL, api_url)
             self.curl.setopt(pycurl.WRITEDATA, buffer)
-            self.curl.perform()
+            if etag:
+                self.curl.setopt(pycurl.HTTPHEADER, self._headers + [f"If-None-Match: {etag}"])
+            try:
+                self.curl.perform()
+            finally:
+                if etag:
+                    self.curl.setopt(pycurl.HTTPHEADER, self._headers)
 
             status_code = self.curl.getinfo(pycurl.RESPONSE_CODE)
+            if status_code == 304:
+                return None
+
             if status_code >= 400:
+                if self._is_rate_limited(status_code):
+                    raise RateLimitError.from_headers(
+                        f"GitLab API rate limit exceeded: {status_code}", self.last_headers)
                 raise DownloadError(f"GitLab API error: {status_code}")
 
-            return json.loads(buffer.getvalue().decode('utf-8'))
+            # The parser takes the UTF-8 bytes directly, no need to decode them first
+            return json_loads(buffer.getvalue())
 
+        except RateLimitError:
+            raise
         except Exception as e:
             raise DownloadError(f"GitLab API request failed: {str(e)}")
         finally:
@@ -53,10 +70,15 @@ class GitLabApi:
         return self.fetch_api(api_url)
 
     def get_latest_commit(self, project_id: int,
-                         branch: str = "main") -> Dict[str, Any]:
-        """Get the latest commit in a branch"""
+                         branch: str = "main",
+                         etag: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get the latest commit in a branch
+
+        If etag is given and the branch has not moved, None is returned.
+        """
         api_url = f"{self.instance}/api/v4/projects/{project_id}/repository/commits/{branch}"
-        return self.fetch_api(api_url)
+        return self.fetch_api(api_url, etag)
 
     def get_file_content(self, project_id: int, file_path: str,
                         ref: str = "main") -> Tuple[str, Dict[str, Any]]:
@@ -75,13 +97,43 @@ class GitLabApi:
             raise DownloadError(f"No content for file: {file_path}")
 
         # Get the content (base64 encoded)
-        import base64
         try:
             content = base64.b64decode(file_info["content"]).decode('utf-8')
             return content, file_info
         except Exception as e:
             raise DownloadError(f"Failed to decode file content: {str(e)}")
 
+    def get_raw_file(self, project_id: int, file_path: str, ref: str = "main") -> bytes:
+        """
+        Get the bytes of a file as stored, without base64 or JSON around them
+
+        Better suited to large files than get_file_content.
+        """
+        encoded_path = urllib.parse.quote_plus(file_path)
+        api_url = f"{self.instance}/api/v4/projects/{project_id}/repository/files/{encoded_path}/raw?ref={ref}"
+        buffer = BytesIO()
+
+        try:
+            self.curl.setopt(pycurl.URL, api_url)
+            self.curl.setopt(pycurl.WRITEDATA, buffer)
+            self.curl.perform()
+
+            status_code = self.curl.getinfo(pycurl.RESPONSE_CODE)
+            if status_code >= 400:
+                if self._is_rate_limited(status_code):
+                    raise RateLimitError.from_headers(
+                        f"GitLab API rate limit exceeded: {status_code}", self.last_headers)
+                raise DownloadError(f"GitLab API error: {status_code}")
+
+            return buffer.getvalue()
+
+        except DownloadError:
+            raise
+        except Exception as e:
+            raise DownloadError(f"GitLab file download failed: {str(e)}")
+        finally:
+            buffer.close()
+
     def get_repository_tree(self, project_id: int, path: str = "",
                           ref: str = "main") -> List[Dict[str, Any]]:
         """Get the contents of a directory"""
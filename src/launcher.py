@@ -154,7 +154,7 @@ def setup_application():
         if not ArchiveProcessor:
             class DummyArchiveProcessor:
                 def is_archive(self, file_path): return False
-                def extract_archive(self, archive_path, extract_dir=None): return extract_dir or ""
+                def extract_archive(self, archive_path, extract_dir=None, css_only=False): return extract_dir or ""
                 def find_css_files(self, directory): return []
                 def validate_extracted_content(self, extract_dir): return False, []
             archive_processor = DummyArchiveProcessor()
@@ -7,7 +7,7 @@ from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QPushButton,
                            QFormLayout, QSpacerItem, QSizePolicy, QDialog,
                            QInputDialog, QStyle, QApplication)
 from PyQt6.QtCore import Qt, pyqtSignal, QItemSelectionModel, QRect
-from PyQt6.QtGui import QAction, QKeySequence, QShortcut, QScreen, QColor, QKeyEvent, QPalette
+from PyQt6.QtGui import QAction, QKeySequence, QShortcut, QScreen, QColor, QKeyEvent, QPalette, QCloseEvent
 from typing import Optional, final, Any
 from src.core.models import Profile, ImportEntry
 
@@ -68,6 +68,7 @@ class MainWindow(QMainWindow):
         # Initialize instance variables
         self.settings_service = None
         self.stacked_widget = None
+        self._update_service = None
         
         # Get the current theme
         app = QApplication.instance()
@@ -123,6 +124,13 @@ class MainWindow(QMainWindow):
         if self.main_presenter:
             self.main_presenter.initialize()
 
+    def closeEvent(self, a0: Optional[QCloseEvent]) -> None:  # override
+        """Handle window close event"""
+        if self._update_service is not None:
+            self._update_service.close()
+            self._update_service = None
+        super().closeEvent(a0)
+
     def setup_ui(self):
         """Set up the main window UI"""
         # Create central widget
@@ -612,21 +620,17 @@ class MainWindow(QMainWindow):
         # Get mod manager from the import_presenter's import service
         mod_manager = self.import_presenter.import_service.mod_manager
         
-        # Initialize components
-        from src.infrastructure.github_api import GitHubApi
-        from src.infrastructure.gitlab_api import GitLabApi
-        
         # Use the download manager from the import service
         download_manager = self.import_presenter.import_service.download_manager
-        github_api = GitHubApi()
-        gitlab_api = GitLabApi()
+        update_service = self._get_update_service()
         
         # Create worker
         self.update_worker = UpdateCheckWorker(
             mod_manager=mod_manager,
             download_manager=download_manager,
-            github_api=github_api,
-            gitlab_api=gitlab_api
+            github_api=update_service.github_api,
+            gitlab_api=update_service.gitlab_api,
+            update_service=update_service
         )
         
         # Connect signals
@@ -637,6 +641,29 @@ class MainWindow(QMainWindow):
         # Start the worker thread
         QThreadPool.globalInstance().start(self.update_worker)
     
+    def _get_update_service(self):
+        """Get the update service shared by update checks and update application"""
+        import_service = self.import_presenter.import_service
+        update_service = self._update_service
+
+        # Reuse the service so results from a check carry over to applying updates
+        if update_service is None or update_service.mod_manager is not import_service.mod_manager:
+            from src.application.update_service import UpdateService
+            from src.infrastructure.github_api import GitHubApi
+            from src.infrastructure.gitlab_api import GitLabApi
+
+            if update_service is not None:
+                update_service.close()
+            update_service = UpdateService(
+                download_manager=import_service.download_manager,
+                mod_manager=import_service.mod_manager,
+                github_api=GitHubApi(),
+                gitlab_api=GitLabApi()
+            )
+            self._update_service = update_service
+
+        return update_service
+
     def _apply_updates(self, mod_names: list) -> None:
         """Apply updates to the selected mods"""
         if not mod_names:
@@ -659,22 +686,18 @@ class MainWindow(QMainWindow):
         # Get mod manager from the import_presenter's import service
         mod_manager = self.import_presenter.import_service.mod_manager
         
-        # Initialize services
-        from src.infrastructure.github_api import GitHubApi
-        from src.infrastructure.gitlab_api import GitLabApi
-        
         # Use the download manager from the import service
         download_manager = self.import_presenter.import_service.download_manager
-        github_api = GitHubApi()
-        gitlab_api = GitLabApi()
+        update_service = self._get_update_service()
         
         # Create worker
         self.update_apply_worker = UpdateApplyWorker(
             mod_manager=mod_manager,
             download_manager=download_manager,
-            github_api=github_api,
-            gitlab_api=gitlab_api,
-            mod_names=mod_names
+            github_api=update_service.github_api,
+            gitlab_api=update_service.gitlab_api,
+            mod_names=mod_names,
+            update_service=update_service
         )
         
         # Connect signals
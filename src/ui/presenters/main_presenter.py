@@ -37,8 +37,7 @@ class MainPresenter:
         installations = self.profile_service.detect_browser_installations()
 
         # Update stored installations
-        for name, path in installations.items():
-            self.profile_service.add_browser_installation(name, path)
+        self.profile_service.add_browser_installations(installations)
 
         # Get all installations (including user-added ones)
         all_installations = self.profile_service.get_browser_installations()
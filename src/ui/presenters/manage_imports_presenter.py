@@ -1,5 +1,6 @@
 from typing import Dict, List, Any, Optional, Protocol, Tuple
 from src.core.models import Profile, ImportEntry
+from src.core.exceptions import FileOperationError
 from src.application.import_service import ImportService
 
 class ManageImportsView(Protocol):
@@ -119,18 +120,24 @@ class ManageImportsPresenter:
         # Count how many imports were successfully removed
         success_count = 0
         
-        # Process each import separately to properly handle mod folder deletion
-        for import_path in import_paths:
-            if not import_path:
-                continue
-            
-            # Call the import service's remove_import method
-            success, message = self.import_service.remove_import(profile, import_path)
-            
-            if success:
-                success_count += 1
-            else:
-                self.view.show_error(message)
+        # Process each import separately to properly handle mod folder deletion.
+        # The mods file is written once for all removed mods.
+        try:
+            with self.import_service.mod_manager.batch():
+                for import_path in import_paths:
+                    if not import_path:
+                        continue
+
+                    # Call the import service's remove_import method
+                    success, message = self.import_service.remove_import(profile, import_path)
+
+                    if success:
+                        success_count += 1
+                    else:
+                        self.view.show_error(message)
+        except FileOperationError as e:
+            # The mods file could not be read or written
+            self.view.show_error(f"Failed to update mod info: {str(e)}")
         
         # Refresh the imports list if at least one import was removed
         if success_count > 0:
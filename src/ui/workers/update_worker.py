@@ -16,12 +16,13 @@ class UpdateCheckWorkerSignals(QObject):
 class UpdateCheckWorker(QRunnable):
     """Worker for checking updates in a background thread"""
     
-    def __init__(self, mod_manager, github_api, gitlab_api, download_manager):
+    def __init__(self, mod_manager, github_api, gitlab_api, download_manager, update_service=None):
         super().__init__()
         self.mod_manager = mod_manager
         self.github_api = github_api
         self.gitlab_api = gitlab_api
         self.download_manager = download_manager
+        self.update_service = update_service
         
         # Create signals
         self.signals = UpdateCheckWorkerSignals()
@@ -29,6 +30,7 @@ class UpdateCheckWorker(QRunnable):
     @pyqtSlot()
     def run(self):
         """Run the update check"""
+        own_service = None
         try:
             # Get all mods
             self.signals.progress.emit("Loading installed mods...")
@@ -38,15 +40,18 @@ class UpdateCheckWorker(QRunnable):
                 self.signals.error.emit("No mods installed")
                 return
                 
-            # Create update service
-            from src.application.update_service import UpdateService
-            
-            update_service = UpdateService(
-                download_manager=self.download_manager,
-                mod_manager=self.mod_manager,
-                github_api=self.github_api,
-                gitlab_api=self.gitlab_api
-            )
+            # Use the shared update service, or create one
+            update_service = self.update_service
+            if update_service is None:
+                from src.application.update_service import UpdateService
+
+                update_service = UpdateService(
+                    download_manager=self.download_manager,
+                    mod_manager=self.mod_manager,
+                    github_api=self.github_api,
+                    gitlab_api=self.gitlab_api
+                )
+                own_service = update_service
             
             # Check for updates
             self.signals.progress.emit("Checking repository status...")
@@ -57,6 +62,10 @@ class UpdateCheckWorker(QRunnable):
             
         except Exception as e:
             self.signals.error.emit(f"Failed to check for updates: {str(e)}")
+        finally:
+            # A service created here has no other users
+            if own_service is not None:
+                own_service.close()
 
 
 class UpdateApplyWorker(QRunnable):
@@ -68,13 +77,15 @@ class UpdateApplyWorker(QRunnable):
         finished = pyqtSignal(int, list)  # success_count, failed_mods
         error = pyqtSignal(str)
     
-    def __init__(self, mod_manager, github_api, gitlab_api, download_manager, mod_names):
+    def __init__(self, mod_manager, github_api, gitlab_api, download_manager, mod_names,
+                 update_service=None):
         super().__init__()
         self.mod_manager = mod_manager
         self.github_api = github_api
         self.gitlab_api = gitlab_api
         self.download_manager = download_manager
         self.mod_names = mod_names
+        self.update_service = update_service
         
         # Create signals
         self.signals = self.Signals()
@@ -82,16 +93,20 @@ class UpdateApplyWorker(QRunnable):
     @pyqtSlot()
     def run(self):
         """Run the update application"""
+        own_service = None
         try:
-            # Create update service
-            from src.application.update_service import UpdateService
-            
-            update_service = UpdateService(
-                download_manager=self.download_manager,
-                mod_manager=self.mod_manager,
-                github_api=self.github_api,
-                gitlab_api=self.gitlab_api
-            )
+            # Use the shared update service, or create one
+            update_service = self.update_service
+            if update_service is None:
+                from src.application.update_service import UpdateService
+
+                update_service = UpdateService(
+                    download_manager=self.download_manager,
+                    mod_manager=self.mod_manager,
+                    github_api=self.github_api,
+                    gitlab_api=self.gitlab_api
+                )
+                own_service = update_service
             
             # Apply updates
             success_count = 0
@@ -99,34 +114,35 @@ class UpdateApplyWorker(QRunnable):
             
             total_mods = len(self.mod_names)
             
-            for i, mod_name in enumerate(self.mod_names):
-                # Emit progress signal
+            if total_mods:
                 self.signals.progress.emit(
-                    f"Updating mod {i+1} of {total_mods}: {mod_name}",
-                    i,
+                    f"Updating mod 1 of {total_mods}: {self.mod_names[0]}",
+                    0,
                     total_mods
                 )
+            
+            # Updates run concurrently, results arrive in order
+            results = update_service.apply_updates(self.mod_names)
+            for i, (mod_name, success, message) in enumerate(results):
+                if success:
+                    success_count += 1
+                else:
+                    failed_mods.append(f"{mod_name} ({message})")
                 
-                try:
-                    # Get mod info
-                    mod = self.mod_manager.get_mod_info(mod_name)
-                    if not mod:
-                        failed_mods.append(f"{mod_name} (not found)")
-                        continue
-                        
-                    # Apply update
-                    success, message = update_service.apply_update(mod_name)
-                    
-                    if success:
-                        success_count += 1
-                    else:
-                        failed_mods.append(f"{mod_name} ({message})")
-                        
-                except Exception as e:
-                    failed_mods.append(f"{mod_name} ({str(e)})")
+                # Emit progress signal
+                if i + 1 < total_mods:
+                    self.signals.progress.emit(
+                        f"Updating mod {i+2} of {total_mods}: {self.mod_names[i+1]}",
+                        i + 1,
+                        total_mods
+                    )
             
             # Emit finished signal
             self.signals.finished.emit(success_count, failed_mods)
             
         except Exception as e:
-            self.signals.error.emit(f"Failed to apply updates: {str(e)}")
\ No newline at end of file
+            self.signals.error.emit(f"Failed to apply updates: {str(e)}")
+        finally:
+            # A service created here has no other users
+            if own_service is not None:
+                own_service.close()